@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -69,8 +70,8 @@ DATABASES = {
         "NAME": "django_db",
         "USER": "postgres",
         "PASSWORD": "postgres",
-        "HOST": "localhost",
-        "PORT": "5555",
+        "HOST": os.environ.get("DB_HOST", "localhost"),
+        "PORT": os.environ.get("DB_PORT", "5555"),
         # "ENGINE": "django.db.backends.sqlite3",
         # "NAME": BASE_DIR / "db.sqlite3",
     }
@@ -105,6 +106,43 @@ USE_TZ = True
 STATIC_URL = "static/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Route status and transition requests to the async views. Turn on when
+# serving config.asgi with an ASGI server (see Dockerfile); under WSGI each
+# async view would need its own event loop.
+POMODORO_ASYNC_VIEWS = os.environ.get("POMODORO_ASYNC_VIEWS", "0") == "1"
+
+# Timer status stream (/status/stream/): seconds between keep-alive messages,
+# which also re-check the active session, and the client reconnect delay.
+POMODORO_STREAM_HEARTBEAT = 15
+POMODORO_STREAM_RETRY_MS = 3000
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+}
+
+# Active session state cache. The locmem default is per process: with more
+# than one worker point this alias at a shared backend (file, Redis,
+# Memcached) so the version stamp is shared and every worker sees writes.
+POMODORO_STATE_CACHE = "default"
+POMODORO_STATE_TIMEOUT = 300
+
+# Largest operation list accepted by /batch/.
+POMODORO_BATCH_MAX_OPERATIONS = 100
+
+# Rows fetched and formatted per chunk by /export/ and the export_logs command.
+POMODORO_EXPORT_CHUNK_SIZE = 2000
+
+# Log retention (archive_logs command): logs older than AFTER_DAYS move, in
+# chunks, to the ArchivedLog table ("table") or to gzipped JSON Lines files
+# under POMODORO_ARCHIVE_DIR ("files").
+POMODORO_ARCHIVE_AFTER_DAYS = 365
+POMODORO_ARCHIVE_BACKEND = "table"
+POMODORO_ARCHIVE_DIR = BASE_DIR / "archive"
+POMODORO_ARCHIVE_CHUNK_SIZE = 5000
+
 JALALI_DATE_DEFAULT = {
     "Strftime": {
         "date": "%y/%m/%d",
@@ -0,0 +1,283 @@
+"""
+Timer actions shared by the single-action endpoints and /batch/. Each takes
+the decoded request body and returns the response payload.
+"""
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import DurationField, ExpressionWrapper, F, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+
+from . import rollups
+from .events import timer_events
+from .models import PomodoroSession, PomodoroLog
+from .state import refresh
+
+
+def publish(event):
+    """
+    Once the transition commits, refresh the cached state and push it to
+    status stream subscribers. Transitions write with queries that send no
+    signals, so this is the only refresh they cost.
+    """
+    transaction.on_commit(lambda: timer_events.publish(event, refresh()))
+
+
+def transition_failed(session_id, error):
+    """The error for a conditional UPDATE that matched no row: a missing session or a wrong state."""
+    if not PomodoroSession.objects.filter(id=session_id, is_active=True).exists():
+        error = "No PomodoroSession matches the given query."
+    return {"success": False, "error": error}
+
+
+def paused_so_far(now):
+    """
+    Time paused since `paused_at`, as a database expression. `now` is read
+    before the row is updated, so a concurrent pause may carry a slightly later
+    timestamp; never count a negative pause.
+    """
+    paused = ExpressionWrapper(Value(now) - Coalesce(F("paused_at"), Value(now)), output_field=DurationField())
+    return Greatest(paused, Value(timezone.timedelta(0), output_field=DurationField()))
+
+
+def start(data):
+    duration = int(data.get("duration", 25))
+    session_name = data.get("session_name", "جلسه مطالعه")
+
+    for attempt in range(3):
+        try:
+            with transaction.atomic():
+                PomodoroSession.objects.filter(is_active=True).update(is_active=False, end_time=timezone.now())
+                # bulk_create skips post_save, whose refresh would repeat publish()'s.
+                [session] = PomodoroSession.objects.bulk_create([PomodoroSession(duration_minutes=duration, session_name=session_name, is_active=True, is_paused=False)])
+                publish("start")
+            break
+        except IntegrityError:
+            # A concurrent start committed its session after our UPDATE ran; deactivate it too.
+            if attempt == 2:
+                raise
+
+    return {"success": True, "session_id": session.id, "duration": duration, "session_name": session_name, "start_time": session.start_time.isoformat()}
+
+
+def pause(data):
+    session_id = data.get("session_id")
+    now = timezone.now()
+
+    with transaction.atomic():
+        if not PomodoroSession.objects.filter(id=session_id, is_active=True, is_paused=False).update(is_paused=True, paused_at=now):
+            return transition_failed(session_id, "Timer is already paused")
+        publish("pause")
+
+    return {"success": True, "is_paused": True, "paused_at": now.isoformat()}
+
+
+def resume(data):
+    session_id = data.get("session_id")
+    now = timezone.now()
+
+    with transaction.atomic():
+        resumed = PomodoroSession.objects.filter(id=session_id, is_active=True, is_paused=True).update(
+            is_paused=False,
+            paused_at=None,
+            total_paused_duration=F("total_paused_duration") + paused_so_far(now),
+        )
+        if not resumed:
+            return transition_failed(session_id, "Timer is not paused")
+        publish("resume")
+
+    return {"success": True, "is_paused": False, "resumed_at": now.isoformat()}
+
+
+def stop(data):
+    session_id = data.get("session_id")
+    completed = data.get("completed", False)
+
+    with transaction.atomic():
+        # Stopping also writes the log, so lock the row rather than racing a conditional UPDATE.
+        session = get_object_or_404(PomodoroSession.objects.select_for_update(), id=session_id, is_active=True)
+        session.end_time = timezone.now()
+        if session.is_paused and session.paused_at:
+            session.total_paused_duration += session.end_time - session.paused_at
+        session.is_active = False
+        PomodoroSession.objects.filter(pk=session.pk).update(end_time=session.end_time, total_paused_duration=session.total_paused_duration, is_active=False)
+        publish("stop")
+
+        log_entry = PomodoroLog.objects.create(session_name=session.session_name, duration_minutes=session.duration_minutes, start_time=session.start_time, end_time=session.end_time, completed=completed)
+        rollups.record(log_entry)
+
+    return {"success": True, "session_id": session.id, "log_id": log_entry.id, "end_time": session.end_time.isoformat(), "completed": completed}
+
+
+def update_session_name(data):
+    session_id = data.get("session_id")
+    new_name = data.get("session_name")
+
+    with transaction.atomic():
+        if not PomodoroSession.objects.filter(id=session_id, is_active=True).update(session_name=new_name):
+            return transition_failed(session_id, "Session is not active")
+        publish("rename")
+
+    return {"success": True, "session_name": new_name}
+
+
+def clean_log_rename(data):
+    """(log id, session name) of one rename, converted and validated as the model fields would; ValidationError if either is invalid."""
+    try:
+        # The same conversion, and error message, as filtering by id.
+        log_id = PomodoroLog._meta.pk.get_prep_value(data.get("log_id"))
+    except (TypeError, ValueError) as e:
+        raise ValidationError(str(e))
+    field = PomodoroLog._meta.get_field("session_name")
+    session_name = data.get("session_name")
+    if session_name is None:
+        raise ValidationError(field.error_messages["null"])
+    session_name = field.to_python(session_name)
+    field.run_validators(session_name)
+    return log_id, session_name
+
+
+def update_log_names(operations):
+    """
+    Rename several logs with one SELECT and one bulk UPDATE; returns a payload
+    per operation. Each one is validated first, so a bad one fails alone.
+    """
+    renames = []
+    for data in operations:
+        try:
+            renames.append(clean_log_rename(data))
+        except ValidationError as e:
+            renames.append(e)
+    logs = PomodoroLog.objects.in_bulk([rename[0] for rename in renames if not isinstance(rename, ValidationError) and rename[0] is not None])
+    results, renamed = [], {}
+    for rename in renames:
+        if isinstance(rename, ValidationError):
+            results.append({"success": False, "error": " ".join(rename.messages)})
+            continue
+        log_id, session_name = rename
+        log_entry = logs.get(log_id)
+        if log_entry is None:
+            results.append({"success": False, "error": "No PomodoroLog matches the given query."})
+            continue
+        log_entry.session_name = session_name
+        renamed[log_id] = log_entry
+        results.append({"success": True, "session_name": session_name})
+    PomodoroLog.objects.bulk_update(renamed.values(), ["session_name"])
+    return results
+
+
+def update_log_name(data):
+    return update_log_names([data])[0]
+
+
+async def apublish(event):
+    """publish() for a statement that already committed in autocommit mode."""
+    timer_events.publish(event, await sync_to_async(refresh)())
+
+
+async def atransition_failed(session_id, error):
+    if not await PomodoroSession.objects.filter(id=session_id, is_active=True).aexists():
+        error = "No PomodoroSession matches the given query."
+    return {"success": False, "error": error}
+
+
+async def apause(data):
+    """pause() with the async ORM. The conditional UPDATE is a single statement, so no transaction is needed."""
+    session_id = data.get("session_id")
+    now = timezone.now()
+    if not await PomodoroSession.objects.filter(id=session_id, is_active=True, is_paused=False).aupdate(is_paused=True, paused_at=now):
+        return await atransition_failed(session_id, "Timer is already paused")
+    await apublish("pause")
+    return {"success": True, "is_paused": True, "paused_at": now.isoformat()}
+
+
+async def aresume(data):
+    session_id = data.get("session_id")
+    now = timezone.now()
+    resumed = await PomodoroSession.objects.filter(id=session_id, is_active=True, is_paused=True).aupdate(
+        is_paused=False,
+        paused_at=None,
+        total_paused_duration=F("total_paused_duration") + paused_so_far(now),
+    )
+    if not resumed:
+        return await atransition_failed(session_id, "Timer is not paused")
+    await apublish("resume")
+    return {"success": True, "is_paused": False, "resumed_at": now.isoformat()}
+
+
+async def aupdate_session_name(data):
+    session_id = data.get("session_id")
+    new_name = data.get("session_name")
+    if not await PomodoroSession.objects.filter(id=session_id, is_active=True).aupdate(session_name=new_name):
+        return await atransition_failed(session_id, "Session is not active")
+    await apublish("rename")
+    return {"success": True, "session_name": new_name}
+
+
+# Start and stop write several rows in one transaction, which the async ORM cannot do yet.
+astart = sync_to_async(start)
+astop = sync_to_async(stop)
+
+
+ACTIONS = {
+    "start": start,
+    "pause": pause,
+    "resume": resume,
+    "stop": stop,
+    "update_session_name": update_session_name,
+    "update_log_name": update_log_name,
+}
+# Actions that act on the current session and may omit session_id in a batch.
+SESSION_ACTIONS = {"pause", "resume", "stop", "update_session_name"}
+
+
+def run_batch(operations):
+    """
+    Apply `operations` in order inside one transaction and return a result per
+    operation. Each operation runs in its own savepoint, so a failing one is
+    rolled back alone and reported. Consecutive log renames become one bulk
+    update. Session actions without a session_id target the session started
+    earlier in the batch, or else the active one, so offline clients can queue
+    actions for sessions they have not been told the id of.
+    """
+    results = []
+    with transaction.atomic():
+        session_id = None
+        index = 0
+        while index < len(operations):
+            data = operations[index]
+            action = data.get("action") if isinstance(data, dict) else None
+
+            if action == "update_log_name":
+                end = index
+                while end < len(operations) and isinstance(operations[end], dict) and operations[end].get("action") == "update_log_name":
+                    end += 1
+                try:
+                    with transaction.atomic():
+                        results.extend(update_log_names(operations[index:end]))
+                except Exception as e:
+                    results.extend({"success": False, "error": str(e)} for _ in range(index, end))
+                index = end
+                continue
+
+            if action not in ACTIONS:
+                results.append({"success": False, "error": f"Unknown action: {action!r}"})
+                index += 1
+                continue
+
+            if action in SESSION_ACTIONS and data.get("session_id") is None:
+                if session_id is None:
+                    session_id = PomodoroSession.objects.filter(is_active=True).values_list("pk", flat=True).first()
+                data = {**data, "session_id": session_id}
+            try:
+                with transaction.atomic():
+                    result = ACTIONS[action](data)
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+            if action == "start" and result["success"]:
+                session_id = result["session_id"]
+            results.append(result)
+            index += 1
+    return results
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from jalali_date.admin import ModelAdminJalaliMixin
-from .models import PomodoroSession, PomodoroLog
+from .models import ArchivedLog, FocusRollup, PomodoroSession, PomodoroLog
 
 
 @admin.register(PomodoroSession)
@@ -37,3 +37,26 @@ class PomodoroLogAdmin(ModelAdminJalaliMixin, admin.ModelAdmin):
 
     def get_queryset(self, request):
         return super().get_queryset(request).select_related("user")
+
+
+@admin.register(FocusRollup)
+class FocusRollupAdmin(admin.ModelAdmin):
+    list_display = ["period", "period_start", "user", "sessions", "completed_sessions", "completed_minutes"]
+    list_filter = ["period"]
+    readonly_fields = ["user", "period", "period_start", "sessions", "completed_sessions", "completed_minutes"]
+    ordering = ["-period_start"]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("user")
+
+
+@admin.register(ArchivedLog)
+class ArchivedLogAdmin(ModelAdminJalaliMixin, admin.ModelAdmin):
+    list_display = ["session_name", "duration_minutes", "start_time", "end_time", "completed", "created_at", "archived_at"]
+    list_filter = ["completed", "archived_at"]
+    search_fields = ["session_name", "user__username"]
+    readonly_fields = ["id", "user", "session_name", "duration_minutes", "start_time", "end_time", "completed", "created_at", "archived_at"]
+    ordering = ["-created_at"]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("user")
@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class PomodoroConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pomodoro'
+
+    def ready(self):
+        from .models import PomodoroLog, PomodoroSession
+        from .rollups import log_deleted
+        from .state import invalidate
+
+        post_save.connect(invalidate, sender=PomodoroSession, dispatch_uid="pomodoro_state_save")
+        post_delete.connect(invalidate, sender=PomodoroSession, dispatch_uid="pomodoro_state_delete")
+        post_delete.connect(log_deleted, sender=PomodoroLog, dispatch_uid="pomodoro_rollups_delete")
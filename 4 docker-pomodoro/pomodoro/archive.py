@@ -0,0 +1,94 @@
+"""
+Retention for PomodoroLog: logs older than POMODORO_ARCHIVE_AFTER_DAYS move
+out of the hot table, one primary-key ordered chunk per transaction, either
+into ArchivedLog ("table") or into gzipped JSON Lines files under
+POMODORO_ARCHIVE_DIR ("files"). Every chunk is complete once it commits, so
+an interrupted run simply continues with the next oldest chunk.
+Rollups are left untouched: they already count archived logs, and
+rollups.rebuild reads the archive as well as the hot table.
+"""
+import datetime
+import gzip
+import json
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import rollups
+from .models import ArchivedLog, PomodoroLog
+
+FIELDS = ["id", "user_id", "session_name", "duration_minutes", "start_time", "end_time", "completed", "created_at"]
+BACKENDS = ["table", "files"]
+
+
+def cutoff(days=None):
+    return timezone.now() - datetime.timedelta(days=settings.POMODORO_ARCHIVE_AFTER_DAYS if days is None else days)
+
+
+def archive_dir():
+    return Path(settings.POMODORO_ARCHIVE_DIR)
+
+
+def file_path(first_pk):
+    # Named after the first id only: a retried chunk overwrites its own file instead of duplicating rows.
+    return archive_dir() / f"pomodoro-logs-{first_pk:012d}.jsonl.gz"
+
+
+def write_file(rows):
+    path = file_path(rows[0]["id"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(".tmp")
+    with open(partial, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as stream:
+            for row in rows:
+                line = json.dumps({**row, **{field: row[field].isoformat() for field in ["start_time", "end_time", "created_at"]}}, ensure_ascii=False)
+                stream.write(line.encode() + b"\n")
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(partial, path)
+    return path
+
+
+def file_rows():
+    """Every log archived to files, with the timestamps parsed back."""
+    for path in sorted(archive_dir().glob("pomodoro-logs-*.jsonl.gz")):
+        with gzip.open(path, "rt", encoding="utf-8") as stream:
+            for line in stream:
+                row = json.loads(line)
+                for field in ["start_time", "end_time", "created_at"]:
+                    row[field] = parse_datetime(row[field])
+                yield row
+
+
+def move_chunk(before, backend, chunk_size):
+    """Move the oldest chunk of logs created before `before`. Returns the number of logs moved."""
+    with transaction.atomic():
+        rows = list(PomodoroLog.objects.filter(created_at__lt=before).order_by("pk").select_for_update().values(*FIELDS)[:chunk_size])
+        if not rows:
+            return 0
+        if backend == "table":
+            ArchivedLog.objects.bulk_create([ArchivedLog(**row) for row in rows], ignore_conflicts=True)
+        else:
+            # Written before the delete commits: a failed commit leaves the rows in place and the file is rewritten next run.
+            write_file(rows)
+        with rollups.kept():
+            PomodoroLog.objects.filter(pk__in=[row["id"] for row in rows]).delete()
+    return len(rows)
+
+
+def run(days=None, backend=None, chunk_size=None, max_chunks=None):
+    """Archive logs older than `days` chunk by chunk, stopping after `max_chunks`. Yields the size of every chunk moved."""
+    backend = backend or settings.POMODORO_ARCHIVE_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown archive backend: {backend}")
+    before, chunks = cutoff(days), 0
+    while max_chunks is None or chunks < max_chunks:
+        moved = move_chunk(before, backend, chunk_size or settings.POMODORO_ARCHIVE_CHUNK_SIZE)
+        if not moved:
+            return
+        chunks += 1
+        yield moved
@@ -0,0 +1,69 @@
+"""
+Async versions of the status and transition views, routed instead of the
+ones in views.py when POMODORO_ASYNC_VIEWS is on (the ASGI deployment).
+Status streams then wait on the event loop rather than holding a worker
+thread each.
+"""
+import json
+
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from . import actions
+from .events import astream, status_payload
+from .state import aget_active
+
+
+async def run_action(request, action):
+    try:
+        data = json.loads(request.body)
+        return JsonResponse(await action(data))
+
+    except Exception as e:
+        return JsonResponse({"success": False, "error": str(e)})
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+async def start_timer(request):
+    return await run_action(request, actions.astart)
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+async def pause_timer(request):
+    return await run_action(request, actions.apause)
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+async def resume_timer(request):
+    return await run_action(request, actions.aresume)
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+async def stop_timer(request):
+    return await run_action(request, actions.astop)
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+async def update_session_name(request):
+    return await run_action(request, actions.aupdate_session_name)
+
+
+async def get_timer_status(request):
+    try:
+        return JsonResponse(status_payload(await aget_active()))
+
+    except Exception as e:
+        return JsonResponse({"success": False, "error": str(e)})
+
+
+async def stream_timer_status(request):
+    response = StreamingHttpResponse(astream(aget_active), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
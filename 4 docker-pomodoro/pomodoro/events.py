@@ -0,0 +1,151 @@
+import asyncio
+import json
+import threading
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import PomodoroSession
+
+
+def snapshot(session):
+    """The state clients need to run the countdown locally, or None without an active session."""
+    if session is None or not session.is_active:
+        return None
+    return {
+        "session_id": session.id,
+        "session_name": session.session_name,
+        "duration_minutes": session.duration_minutes,
+        "start_time": session.start_time,
+        "is_paused": session.is_paused,
+        "paused_at": session.paused_at,
+        "total_paused_duration": session.total_paused_duration,
+    }
+
+
+def status_payload(state):
+    """The /status/ response for a snapshot, with the remaining time computed now."""
+    if state is None:
+        return {"success": True, "active": False}
+
+    session = PomodoroSession(
+        id=state["session_id"],
+        duration_minutes=state["duration_minutes"],
+        start_time=state["start_time"],
+        is_active=True,
+        is_paused=state["is_paused"],
+        paused_at=state["paused_at"],
+        total_paused_duration=state["total_paused_duration"],
+    )
+    total_seconds = int(session.remaining_time.total_seconds())
+    return {
+        "success": True,
+        "active": True,
+        "session_id": state["session_id"],
+        "session_name": state["session_name"],
+        "duration_minutes": state["duration_minutes"],
+        "remaining_minutes": total_seconds // 60,
+        "remaining_seconds": total_seconds % 60,
+        "is_paused": state["is_paused"],
+        "start_time": state["start_time"].isoformat(),
+    }
+
+
+class TimerEvents:
+    """
+    In-process broadcaster of timer state transitions. Subscribers only keep
+    the sequence number of the last event they have seen.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.sequence = 0
+        self.event = None
+        self.state = None
+        # (loop, asyncio.Event) pairs of coroutines waiting in async_wait().
+        self.async_waiters = set()
+
+    def publish(self, event, state):
+        with self.condition:
+            self.sequence += 1
+            self.event, self.state = event, state
+            self.condition.notify_all()
+            for loop, waiter in self.async_waiters:
+                loop.call_soon_threadsafe(waiter.set)
+
+    def wait(self, sequence, timeout):
+        """Block until an event newer than `sequence` is published or `timeout` passes."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.sequence != sequence, timeout)
+            return self.sequence, self.event, self.state
+
+    async def async_wait(self, sequence, timeout):
+        """wait() for coroutines: suspends without holding a thread."""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self.condition:
+            if self.sequence != sequence:
+                return self.sequence, self.event, self.state
+            self.async_waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+        except TimeoutError:
+            pass
+        finally:
+            with self.condition:
+                self.async_waiters.discard(waiter)
+        with self.condition:
+            return self.sequence, self.event, self.state
+
+
+timer_events = TimerEvents()
+
+
+def format_event(event, state):
+    return f"data: {json.dumps({'event': event, **status_payload(state)})}\n\n"
+
+
+def stream(load_state):
+    """
+    Server-Sent Events generator: the current state first, then one message per
+    transition and a comment line every POMODORO_STREAM_HEARTBEAT seconds.
+    A heartbeat also calls `load_state` again, which picks up transitions made
+    by other worker processes.
+    """
+    sequence, state = timer_events.sequence, load_state()
+    yield f"retry: {settings.POMODORO_STREAM_RETRY_MS}\n\n"
+    yield format_event("snapshot", state)
+
+    while True:
+        new_sequence, event, new_state = timer_events.wait(sequence, settings.POMODORO_STREAM_HEARTBEAT)
+        if new_sequence != sequence:
+            sequence, state = new_sequence, new_state
+            yield format_event(event, state)
+            continue
+
+        current = load_state()
+        if current != state:
+            state = current
+            yield format_event("sync", state)
+        else:
+            yield f": keep-alive {timezone.now().isoformat()}\n\n"
+
+
+async def astream(load_state):
+    """stream() for ASGI: the same messages, with `load_state` a coroutine function."""
+    sequence, state = timer_events.sequence, await load_state()
+    yield f"retry: {settings.POMODORO_STREAM_RETRY_MS}\n\n"
+    yield format_event("snapshot", state)
+
+    while True:
+        new_sequence, event, new_state = await timer_events.async_wait(sequence, settings.POMODORO_STREAM_HEARTBEAT)
+        if new_sequence != sequence:
+            sequence, state = new_sequence, new_state
+            yield format_event(event, state)
+            continue
+
+        current = await load_state()
+        if current != state:
+            state = current
+            yield format_event("sync", state)
+        else:
+            yield f": keep-alive {timezone.now().isoformat()}\n\n"
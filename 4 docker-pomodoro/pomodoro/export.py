@@ -0,0 +1,56 @@
+"""
+Streaming export of PomodoroLog history as CSV or JSON Lines. Rows are read
+with .iterator(), formatted one chunk at a time and yielded as text, so
+memory use does not grow with the table.
+"""
+import csv
+import io
+import json
+from itertools import islice
+
+from . import jalali
+from .models import PomodoroLog
+
+FIELDS = ["id", "session_name", "duration_minutes", "completed", "start_time", "end_time", "created_at"]
+COLUMNS = FIELDS + ["start_jalali", "end_jalali"]
+CONTENT_TYPES = {"csv": "text/csv; charset=utf-8", "jsonl": "application/x-ndjson"}
+
+
+def chunks(queryset, chunk_size):
+    """Export dicts for `queryset`, one list per chunk, with the Jalali columns filled in per chunk."""
+    rows = queryset.order_by("pk").values(*FIELDS).iterator(chunk_size=chunk_size)
+    while chunk := list(islice(rows, chunk_size)):
+        starts = jalali.format_many([row["start_time"] for row in chunk], "%Y/%m/%d %H:%M")
+        ends = jalali.format_many([row["end_time"] for row in chunk], "%Y/%m/%d %H:%M")
+        for row, start, end in zip(chunk, starts, ends):
+            for field in ["start_time", "end_time", "created_at"]:
+                row[field] = row[field].isoformat()
+            row["start_jalali"], row["end_jalali"] = start, end
+        yield chunk
+
+
+def csv_lines(queryset, chunk_size=2000):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, COLUMNS)
+    writer.writeheader()
+    for chunk in chunks(queryset, chunk_size):
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def jsonl_lines(queryset, chunk_size=2000):
+    for chunk in chunks(queryset, chunk_size):
+        yield "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in chunk)
+
+
+FORMATS = {"csv": csv_lines, "jsonl": jsonl_lines}
+
+
+def export(export_format, queryset=None, chunk_size=2000):
+    """Text chunks of the export in `export_format` ("csv" or "jsonl")."""
+    if queryset is None:
+        queryset = PomodoroLog.objects.all()
+    return FORMATS[export_format](queryset, chunk_size)
@@ -0,0 +1,51 @@
+"""
+Cached Gregorian to Jalali conversion for templates and exports. Log
+timestamps never change, so conversions are memoized in bounded LRU caches
+keyed by the value, the active time zone and jdatetime's locale.
+"""
+import datetime
+from functools import lru_cache
+
+import jdatetime
+from django.utils import timezone
+
+CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _convert(value, tz, locale):
+    if isinstance(value, datetime.datetime):
+        if timezone.is_aware(value):
+            value = timezone.make_naive(value, tz)
+        return jdatetime.datetime.fromgregorian(datetime=value, locale=locale)
+    return jdatetime.date.fromgregorian(date=value, locale=locale)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _format(value, format_string, tz, locale):
+    return _convert(value, tz, locale).strftime(format_string)
+
+
+def to_jalali(value):
+    """Same result as jalali_date.datetime2jalali (or date2jalali for dates), memoized."""
+    if not value:
+        return None
+    return _convert(value, timezone.get_current_timezone(), jdatetime.get_locale())
+
+
+def format(value, format_string="%Y/%m/%d"):
+    """`value` in the current time zone, formatted as a Jalali date; "" for empty values."""
+    if not value:
+        return ""
+    return _format(value, format_string, timezone.get_current_timezone(), jdatetime.get_locale())
+
+
+def format_many(values, format_string="%Y/%m/%d"):
+    """Format a whole column of timestamps, resolving the time zone and locale once."""
+    tz, locale = timezone.get_current_timezone(), jdatetime.get_locale()
+    return [_format(value, format_string, tz, locale) if value else "" for value in values]
+
+
+def cache_clear():
+    _convert.cache_clear()
+    _format.cache_clear()
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from pomodoro.archive import BACKENDS, run
+
+
+class Command(BaseCommand):
+    help = "Move old Pomodoro logs out of the hot table. Safe to interrupt and run again; each chunk commits on its own."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=int, help="Defaults to POMODORO_ARCHIVE_AFTER_DAYS.")
+        parser.add_argument("--backend", choices=BACKENDS, help="Defaults to POMODORO_ARCHIVE_BACKEND.")
+        parser.add_argument("--chunk-size", type=int, help="Defaults to POMODORO_ARCHIVE_CHUNK_SIZE.")
+        parser.add_argument("--max-chunks", type=int, help="Stop after this many chunks, for incremental runs.")
+
+    def handle(self, *args, **options):
+        total = 0
+        for moved in run(days=options["older_than_days"], backend=options["backend"], chunk_size=options["chunk_size"], max_chunks=options["max_chunks"]):
+            total += moved
+            self.stdout.write(f"Archived {moved} logs")
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} logs in total"))
@@ -0,0 +1,69 @@
+import datetime
+import time
+
+from django import template
+from django.core.management.base import BaseCommand
+from django.template import Context, Engine
+from django.utils import timezone
+from jalali_date import datetime2jalali
+
+from pomodoro import jalali
+from pomodoro.models import PomodoroLog
+
+# The filters as they were before the conversion cache, loaded under the same
+# library name so both runs render the same template.
+register = template.Library()
+
+
+@register.filter
+def jalali_date(value, format_string="%Y/%m/%d"):
+    return datetime2jalali(value).strftime(format_string) if value else ""
+
+
+register.filter("jalali_datetime", jalali_date)
+register.filter("jalali_time", jalali_date)
+
+TEMPLATE = """{% load pomodoro_extras %}{% for log in logs %}
+{{ log.session_name }} {{ log.start_time|jalali_datetime:"%Y/%m/%d %H:%M" }} - {{ log.end_time|jalali_time:"%H:%M" }} ({{ log.start_time|jalali_date }})
+{% endfor %}"""
+
+
+class Command(BaseCommand):
+    help = "Measure the cost of rendering Jalali dates for log rows, with and without the conversion cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5, help="Renders per measurement; the best one is reported.")
+
+    def handle(self, *args, **options):
+        start = timezone.now()
+        logs = [PomodoroLog(session_name=f"Log {i}", duration_minutes=25, start_time=start - datetime.timedelta(minutes=30 * i), end_time=start - datetime.timedelta(minutes=30 * i - 25)) for i in range(options["rows"])]
+        context = Context({"logs": logs})
+        uncached = Engine(libraries={"pomodoro_extras": __name__}).from_string(TEMPLATE)
+        cached = Engine(libraries={"pomodoro_extras": "pomodoro.templatetags.pomodoro_extras"}).from_string(TEMPLATE)
+        if uncached.render(context) != cached.render(context):
+            self.stderr.write(self.style.ERROR("Cached and uncached filters render differently"))
+            return
+
+        def cold():
+            jalali.cache_clear()
+            cached.render(context)
+
+        per_rows = 1000 / options["rows"]
+        results = {
+            "before (datetime2jalali per filter)": self.best(lambda: uncached.render(context), options["repeat"]),
+            "after, cold cache": self.best(cold, options["repeat"]),
+            "after, warm cache": self.best(lambda: cached.render(context), options["repeat"]),
+            "format_many, one column, warm cache": self.best(lambda: [jalali.format_many([log.start_time for log in logs], "%Y/%m/%d %H:%M")], options["repeat"]),
+        }
+        for name, seconds in results.items():
+            self.stdout.write(f"{name:<40} {seconds * 1000 * per_rows:8.2f} ms per 1,000 rows")
+
+    @staticmethod
+    def best(action, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            action()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
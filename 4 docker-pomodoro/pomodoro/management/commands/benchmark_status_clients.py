@@ -0,0 +1,99 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+async def open_request(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    status = await reader.readline()
+    if b" 200 " not in status:
+        writer.close()
+        raise ConnectionError(status.decode(errors="replace").strip() or "no response")
+    return reader, writer
+
+
+async def hold_stream(host, port, release, timeout):
+    """Open /status/stream/, wait for its first event and keep it open until `release` is set. Returns seconds to the first event."""
+    started = time.perf_counter()
+    reader, writer = await asyncio.wait_for(open_request(host, port, "/status/stream/"), timeout)
+    try:
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout)
+            if not line:
+                raise ConnectionError("stream closed before its first event")
+            if line.startswith(b"data: "):
+                break
+        first_event = time.perf_counter() - started
+        await release.wait()
+        return first_event
+    finally:
+        writer.close()
+
+
+async def probe(host, port, timeout):
+    """One /status/ request on a fresh connection. Returns its latency in seconds."""
+    started = time.perf_counter()
+    reader, writer = await asyncio.wait_for(open_request(host, port, "/status/"), timeout)
+    try:
+        await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+    return time.perf_counter() - started
+
+
+def percentile(values, fraction):
+    return sorted(values)[min(int(len(values) * fraction), len(values) - 1)] if values else float("nan")
+
+
+class Command(BaseCommand):
+    help = (
+        "Hold many idle /status/stream/ clients open against running servers and measure /status/ latency meanwhile. "
+        "Run one target under WSGI and one under ASGI to compare them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target", action="append", required=True, help="name=http://host:port, repeatable, e.g. wsgi=http://127.0.0.1:8001")
+        parser.add_argument("--clients", type=int, default=200, help="Idle stream connections to hold open.")
+        parser.add_argument("--probes", type=int, default=50, help="/status/ requests sent while the streams are open.")
+        parser.add_argument("--timeout", type=float, default=10)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'target':<10} {'streams':>9} {'first evt p95':>14} {'status p50':>11} {'status p95':>11} {'status ok':>10}")
+        for target in options["target"]:
+            name, _, url = target.rpartition("=")
+            parts = urlsplit(url)
+            if not parts.hostname:
+                raise CommandError(f"Invalid target: {target}")
+            result = asyncio.run(self.run(parts.hostname, parts.port or 80, options))
+            self.stdout.write(
+                f"{name or url:<10} {result['streams']:>4}/{options['clients']:<4} {result['first_event_p95'] * 1000:>11.1f} ms"
+                f" {result['status_p50'] * 1000:>8.1f} ms {result['status_p95'] * 1000:>8.1f} ms {result['probes']:>4}/{options['probes']:<4}"
+            )
+
+    async def run(self, host, port, options):
+        release = asyncio.Event()
+        streams = [asyncio.create_task(hold_stream(host, port, release, options["timeout"])) for _ in range(options["clients"])]
+        # Give the streams time to connect before probing, as long-lived clients would have.
+        await asyncio.wait(streams, timeout=min(options["timeout"], 2))
+
+        latencies = []
+        for _ in range(options["probes"]):
+            try:
+                latencies.append(await probe(host, port, options["timeout"]))
+            except (OSError, TimeoutError):
+                pass
+
+        release.set()
+        first_events = [result for result in await asyncio.gather(*streams, return_exceptions=True) if isinstance(result, float)]
+        return {
+            "streams": len(first_events),
+            "first_event_p95": percentile(first_events, 0.95),
+            "status_p50": statistics.median(latencies) if latencies else float("nan"),
+            "status_p95": percentile(latencies, 0.95),
+            "probes": len(latencies),
+        }
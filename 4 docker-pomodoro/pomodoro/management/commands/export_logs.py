@@ -0,0 +1,33 @@
+import gzip
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from pomodoro.export import FORMATS, export
+
+
+class Command(BaseCommand):
+    help = "Stream the Pomodoro log history to a CSV or JSON Lines file, optionally gzipped."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+        parser.add_argument("--output", default="-", help='File to write, "-" for stdout. A .gz suffix implies --gzip.')
+        parser.add_argument("--gzip", action="store_true")
+        parser.add_argument("--chunk-size", type=int, default=settings.POMODORO_EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        chunks = export(options["format"], chunk_size=options["chunk_size"])
+        if options["gzip"] or output.endswith(".gz"):
+            stream = gzip.open(sys.stdout.buffer if output == "-" else output, "wt", encoding="utf-8", newline="")
+        elif output == "-":
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+        else:
+            stream = open(output, "w", encoding="utf-8", newline="")
+
+        with stream:
+            for chunk in chunks:
+                stream.write(chunk)
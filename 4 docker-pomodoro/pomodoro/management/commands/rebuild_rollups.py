@@ -0,0 +1,18 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from pomodoro.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily and weekly focus rollups from the whole Pomodoro log history."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Logs aggregated per query.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rollups inserted per query.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = rebuild(chunk_size=options["chunk_size"], batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} rollups in {time.perf_counter() - started:.2f}s"))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-18 00:08
+
+import django.db.models.deletion
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pomodoro', '0002_alter_pomodorosession_session_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FocusRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('day', 'Day'), ('week', 'Week')], max_length=4)),
+                ('period_start', models.DateField()),
+                ('sessions', models.PositiveIntegerField(default=0)),
+                ('completed_sessions', models.PositiveIntegerField(default=0)),
+                ('completed_minutes', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-period_start'],
+                'constraints': [models.UniqueConstraint(django.db.models.functions.comparison.Coalesce('user', 0), models.F('period'), models.F('period_start'), name='unique_focus_rollup')],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.6 on 2026-10-18 00:09
+
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def deactivate_duplicate_active_sessions(apps, schema_editor):
+    """Keep only the newest active session per user so the unique constraint can be added."""
+    PomodoroSession = apps.get_model("pomodoro", "PomodoroSession")
+    seen, duplicates = set(), []
+    for pk, user_id in PomodoroSession.objects.filter(is_active=True).order_by("-start_time").values_list("pk", "user_id"):
+        if user_id in seen:
+            duplicates.append(pk)
+        seen.add(user_id)
+    PomodoroSession.objects.filter(pk__in=duplicates).update(is_active=False, is_paused=False, end_time=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pomodoro', '0003_focusrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(deactivate_duplicate_active_sessions, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='pomodorolog',
+            index=models.Index(fields=['-created_at'], name='pomodoro_log_created'),
+        ),
+        migrations.AddIndex(
+            model_name='pomodorolog',
+            index=models.Index(fields=['user', '-created_at'], name='pomodoro_log_user_created'),
+        ),
+        migrations.AddIndex(
+            model_name='pomodorosession',
+            index=models.Index(fields=['user', '-start_time'], name='pomodoro_session_user_start'),
+        ),
+        migrations.AddConstraint(
+            model_name='pomodorosession',
+            constraint=models.UniqueConstraint(django.db.models.functions.comparison.Coalesce('user', 0), condition=models.Q(('is_active', True)), name='one_active_session_per_user'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.contrib.auth.models import User
 
@@ -17,6 +18,13 @@ class PomodoroSession(models.Model):
 
     class Meta:
         ordering = ["-start_time"]
+        indexes = [
+            models.Index(fields=["user", "-start_time"], name="pomodoro_session_user_start"),
+        ]
+        constraints = [
+            # Also serves the hot `is_active=True` lookups: the index only holds active rows.
+            models.UniqueConstraint(Coalesce("user", 0), condition=models.Q(is_active=True), name="one_active_session_per_user"),
+        ]
 
     def __str__(self):
         return f"{self.session_name} - {self.duration_minutes}min ({'Active' if self.is_active else 'Completed'})"
@@ -52,6 +60,58 @@ class PomodoroLog(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at"], name="pomodoro_log_created"),
+            models.Index(fields=["user", "-created_at"], name="pomodoro_log_user_created"),
+        ]
 
     def __str__(self):
         return f"{self.session_name} - {self.duration_minutes}min ({self.start_time.strftime('%Y-%m-%d %H:%M')})"
+
+
+class ArchivedLog(models.Model):
+    """A PomodoroLog moved out of the hot table by the archiver, keeping its original id."""
+
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
+    session_name = models.CharField(max_length=200)
+    duration_minutes = models.PositiveIntegerField()
+    start_time = models.DateTimeField()
+    end_time = models.DateTimeField()
+    completed = models.BooleanField(default=True)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.session_name} - {self.duration_minutes}min ({self.start_time.strftime('%Y-%m-%d %H:%M')})"
+
+
+class FocusRollup(models.Model):
+    """Focus totals per user and Jalali day or week (starting Saturday), kept in step with PomodoroLog."""
+
+    DAY = "day"
+    WEEK = "week"
+    PERIOD_CHOICES = [(DAY, "Day"), (WEEK, "Week")]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
+    period = models.CharField(max_length=4, choices=PERIOD_CHOICES)
+    period_start = models.DateField()
+    sessions = models.PositiveIntegerField(default=0)
+    completed_sessions = models.PositiveIntegerField(default=0)
+    completed_minutes = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-period_start"]
+        constraints = [
+            models.UniqueConstraint(Coalesce("user", 0), "period", "period_start", name="unique_focus_rollup"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_period_display()} {self.period_start} - {self.completed_minutes}min"
+
+    @property
+    def completion_rate(self):
+        return self.completed_sessions / self.sessions if self.sessions else 0
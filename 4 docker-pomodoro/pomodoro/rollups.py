@@ -0,0 +1,143 @@
+import datetime
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+from . import archive, jalali
+from .models import ArchivedLog, FocusRollup, PomodoroLog
+
+_keep = ContextVar("pomodoro_keep_rollups", default=False)
+
+
+def week_start(day):
+    """The Saturday that starts the Jalali week containing `day`."""
+    return day - datetime.timedelta(days=(day.weekday() + 2) % 7)
+
+
+def period_starts(day):
+    return {FocusRollup.DAY: day, FocusRollup.WEEK: week_start(day)}
+
+
+def log_day(log):
+    return timezone.localdate(log.start_time)
+
+
+def record(log):
+    """Add one log to its day and week rollups. Call inside the transaction that writes the log."""
+    completed = int(log.completed)
+    minutes = log.duration_minutes if log.completed else 0
+    for period, start in period_starts(log_day(log)).items():
+        rollups = FocusRollup.objects.filter(user=log.user, period=period, period_start=start)
+        increments = {"sessions": F("sessions") + 1, "completed_sessions": F("completed_sessions") + completed, "completed_minutes": F("completed_minutes") + minutes}
+        if rollups.update(**increments):
+            continue
+        try:
+            with transaction.atomic():
+                FocusRollup.objects.create(user=log.user, period=period, period_start=start, sessions=1, completed_sessions=completed, completed_minutes=minutes)
+        except IntegrityError:
+            # Another request created the row first.
+            rollups.update(**increments)
+
+
+def forget(log):
+    """Take a deleted log back out of its day and week rollups, in one UPDATE."""
+    completed = int(log.completed)
+    minutes = log.duration_minutes if log.completed else 0
+    periods = Q()
+    for period, start in period_starts(log_day(log)).items():
+        periods |= Q(period=period, period_start=start)
+    FocusRollup.objects.filter(periods, user_id=log.user_id).update(
+        sessions=Greatest(F("sessions") - 1, 0),
+        completed_sessions=Greatest(F("completed_sessions") - completed, 0),
+        completed_minutes=Greatest(F("completed_minutes") - minutes, 0),
+    )
+
+
+@contextmanager
+def kept():
+    """Leave the rollups alone for logs deleted in the block, e.g. because they move to the archive."""
+    token = _keep.set(True)
+    try:
+        yield
+    finally:
+        _keep.reset(token)
+
+
+def log_deleted(instance, **kwargs):
+    """Signal receiver: deleted logs, from the admin or anywhere else, stop counting towards the stats."""
+    if not _keep.get():
+        forget(instance)
+
+
+def aggregate_logs(queryset, totals, chunk_size=5000):
+    """Fold `queryset` into `totals`, keyed by (user_id, period, period_start), one primary key range at a time."""
+    last_pk = 0
+    while True:
+        pks = list(queryset.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)[:chunk_size])
+        if not pks:
+            return totals
+        rows = (
+            queryset.filter(pk__gte=pks[0], pk__lte=pks[-1])
+            .order_by()
+            .values("user_id", day=TruncDate("start_time"))
+            .annotate(sessions=Count("pk"), completed_sessions=Count("pk", filter=Q(completed=True)), completed_minutes=Sum("duration_minutes", filter=Q(completed=True)))
+        )
+        for row in rows:
+            add(totals, row["user_id"], row["day"], row["sessions"], row["completed_sessions"], row["completed_minutes"] or 0)
+        last_pk = pks[-1]
+
+
+def add(totals, user_id, day, sessions, completed_sessions, completed_minutes):
+    for period, start in period_starts(day).items():
+        total = totals[user_id, period, start]
+        total["sessions"] += sessions
+        total["completed_sessions"] += completed_sessions
+        total["completed_minutes"] += completed_minutes
+
+
+def new_totals():
+    return defaultdict(lambda: {"sessions": 0, "completed_sessions": 0, "completed_minutes": 0})
+
+
+def rebuild(chunk_size=5000, batch_size=1000):
+    """
+    Recompute every rollup from the log history, archived logs included, and
+    swap them in atomically. Returns the number of rows written.
+    """
+    totals = new_totals()
+    for queryset in [PomodoroLog.objects.all(), ArchivedLog.objects.all()]:
+        aggregate_logs(queryset, totals, chunk_size)
+    for row in archive.file_rows():
+        add(totals, row["user_id"], timezone.localdate(row["start_time"]), 1, int(row["completed"]), row["duration_minutes"] if row["completed"] else 0)
+    rollups = [FocusRollup(user_id=user_id, period=period, period_start=start, **values) for (user_id, period, start), values in totals.items()]
+    with transaction.atomic():
+        FocusRollup.objects.all().delete()
+        FocusRollup.objects.bulk_create(rollups, batch_size=batch_size)
+    return len(rollups)
+
+
+def serialize(rollup):
+    return {
+        "period_start": rollup.period_start.isoformat(),
+        "jalali": jalali.format(rollup.period_start),
+        "sessions": rollup.sessions,
+        "completed_sessions": rollup.completed_sessions,
+        "completed_minutes": rollup.completed_minutes,
+        "completion_rate": round(rollup.completion_rate, 3),
+    }
+
+
+def stats(user=None, days=14, weeks=8):
+    """Recent day and week rollups for `user`, newest first, read from the rollup table only."""
+    today = timezone.localdate()
+    since = {FocusRollup.DAY: today - datetime.timedelta(days=days - 1), FocusRollup.WEEK: week_start(today) - datetime.timedelta(weeks=weeks - 1)}
+    rollups = FocusRollup.objects.filter(user=user).filter(Q(period=FocusRollup.DAY, period_start__gte=since[FocusRollup.DAY]) | Q(period=FocusRollup.WEEK, period_start__gte=since[FocusRollup.WEEK]))
+    result = {FocusRollup.DAY: [], FocusRollup.WEEK: []}
+    for rollup in rollups:
+        result[rollup.period].append(serialize(rollup))
+    return {"days": result[FocusRollup.DAY], "weeks": result[FocusRollup.WEEK]}
@@ -0,0 +1,78 @@
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .events import snapshot
+from .models import PomodoroSession
+
+VERSION_KEY = "pomodoro:active:version"
+
+
+def get_cache():
+    return caches[settings.POMODORO_STATE_CACHE]
+
+
+def state_key(version):
+    return f"pomodoro:active:{version}"
+
+
+def load():
+    return snapshot(PomodoroSession.objects.filter(is_active=True).first())
+
+
+def get_version():
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Start from the clock so a flushed cache never reuses old versions.
+        cache.add(VERSION_KEY, time.time_ns() // 1000, None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def get_active():
+    """Snapshot of the active session, read from the cache and loaded from the database only on a miss."""
+    cache = get_cache()
+    key = state_key(get_version())
+    cached = cache.get(key)
+    if cached is None:
+        cached = {"state": load()}
+        cache.add(key, cached, settings.POMODORO_STATE_TIMEOUT)
+    return cached["state"]
+
+
+async def aget_active():
+    """get_active() for async views, using the async cache and ORM APIs."""
+    cache = get_cache()
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        version = await sync_to_async(get_version)()
+    key = state_key(version)
+    cached = await cache.aget(key)
+    if cached is None:
+        cached = {"state": snapshot(await PomodoroSession.objects.filter(is_active=True).afirst())}
+        await cache.aadd(key, cached, settings.POMODORO_STATE_TIMEOUT)
+    return cached["state"]
+
+
+def refresh():
+    """
+    Bump the version stamp, then store a fresh snapshot under it. The load
+    happens after the bump, so the newest version always holds state at least
+    as recent as the last committed write, whichever process made it.
+    Returns the stored snapshot.
+    """
+    cache = get_cache()
+    get_version()
+    version = cache.incr(VERSION_KEY)
+    state = load()
+    cache.set(state_key(version), {"state": state}, settings.POMODORO_STATE_TIMEOUT)
+    return state
+
+
+def invalidate(**kwargs):
+    """Signal receiver: refresh the cached state once the session write is committed."""
+    transaction.on_commit(refresh)
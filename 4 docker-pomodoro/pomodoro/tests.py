@@ -1,3 +1,559 @@
-from django.test import TestCase
+import csv
+import datetime
+import gzip
+import io
+import json
+import random
+import os
+import re
+import tempfile
+import threading
+import unittest
+from collections import Counter
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import AsyncRequestFactory, Client, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from jalali_date import datetime2jalali
+from django.utils import timezone
+
+from . import archive, async_views, jalali, rollups, state
+from .models import ArchivedLog, FocusRollup, PomodoroSession, PomodoroLog
+from .templatetags import pomodoro_extras
+
+
+class PomodoroTestCase(TestCase):
+    def setUp(self):
+        state.get_cache().clear()
+
+    def post(self, url, **data):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(url, json.dumps(data), content_type="application/json").json()
+
+    def start(self, duration=25, session_name="Focus"):
+        return self.post("/start/", duration=duration, session_name=session_name)
+
+
+def read_event(stream):
+    """Next SSE data message from a streaming response, skipping comments and retry lines."""
+    for chunk in stream:
+        chunk = chunk.decode()
+        if chunk.startswith("data: "):
+            return json.loads(chunk[len("data: "):])
+
+
+@override_settings(POMODORO_STREAM_HEARTBEAT=0.01)
+class StatusStreamTests(PomodoroTestCase):
+    def test_first_message_is_current_state(self):
+        started = self.start(duration=10)
+        response = self.client.get("/status/stream/")
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        event = read_event(response.streaming_content)
+        self.assertEqual(event["event"], "snapshot")
+        self.assertEqual(event["session_id"], started["session_id"])
+        self.assertIn(event["remaining_minutes"] * 60 + event["remaining_seconds"], (599, 600))
+
+    def test_transitions_are_pushed(self):
+        started = self.start()
+        stream = self.client.get("/status/stream/").streaming_content
+        read_event(stream)
+
+        self.post("/pause/", session_id=started["session_id"])
+        event = read_event(stream)
+        self.assertEqual([event["event"], event["is_paused"]], ["pause", True])
+        self.post("/update-session-name/", session_id=started["session_id"], session_name="Renamed")
+        self.assertEqual(read_event(stream)["session_name"], "Renamed")
+        self.post("/stop/", session_id=started["session_id"])
+        event = read_event(stream)
+        self.assertEqual([event["event"], event["active"]], ["stop", False])
+
+    def test_heartbeat_picks_up_changes_from_other_processes(self):
+        stream = self.client.get("/status/stream/").streaming_content
+        self.assertFalse(read_event(stream)["active"])
+        with self.captureOnCommitCallbacks(execute=True):
+            PomodoroSession.objects.create(session_name="Elsewhere")
+        event = read_event(stream)
+        self.assertEqual([event["event"], event["session_name"]], ["sync", "Elsewhere"])
+
+    def test_status_endpoint_keeps_its_shape(self):
+        self.assertEqual(self.client.get("/status/").json(), {"success": True, "active": False})
+        started = self.start(session_name="Reading")
+        status = self.client.get("/status/").json()
+        self.assertEqual(set(status), {"success", "active", "session_id", "session_name", "duration_minutes", "remaining_minutes", "remaining_seconds", "is_paused", "start_time"})
+        self.assertEqual(status["session_id"], started["session_id"])
+
+
+class StateCacheTests(PomodoroTestCase):
+    def test_status_reads_do_not_touch_the_database(self):
+        started = self.start(duration=5)
+        with self.assertNumQueries(0):
+            status = self.client.get("/status/").json()
+        self.assertEqual(status["session_id"], started["session_id"])
+
+        self.post("/pause/", session_id=started["session_id"])
+        with self.assertNumQueries(0):
+            self.assertTrue(self.client.get("/status/").json()["is_paused"])
+
+        self.post("/stop/", session_id=started["session_id"])
+        with self.assertNumQueries(0):
+            self.assertFalse(self.client.get("/status/").json()["active"])
+
+    def test_cold_cache_loads_once(self):
+        PomodoroSession.objects.create(session_name="Warm")
+        with self.assertNumQueries(1):
+            self.assertEqual(state.get_active()["session_name"], "Warm")
+        with self.assertNumQueries(0):
+            self.assertEqual(state.get_active()["session_name"], "Warm")
+
+    def test_rolled_back_writes_leave_the_cache_alone(self):
+        started = self.start()
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                PomodoroSession.objects.filter(pk=started["session_id"]).get().delete()
+                raise RuntimeError
+        self.assertEqual(state.get_active()["session_id"], started["session_id"])
+
+    def test_newest_version_wins_over_late_writers(self):
+        started = self.start(session_name="First")
+        stale_version = state.get_version()
+        PomodoroSession.objects.filter(pk=started["session_id"]).update(session_name="Second")
+        state.refresh()
+        # A slower writer storing under the version it read earlier is never seen.
+        state.get_cache().set(state.state_key(stale_version), {"state": None})
+        self.assertEqual(state.get_active()["session_name"], "Second")
+
+
+class RollupTests(PomodoroTestCase):
+    def finish(self, duration, completed):
+        started = self.start(duration=duration)
+        return self.post("/stop/", session_id=started["session_id"], completed=completed)
+
+    def totals(self):
+        return {(rollup.period, rollup.period_start): (rollup.sessions, rollup.completed_sessions, rollup.completed_minutes) for rollup in FocusRollup.objects.all()}
+
+    def test_week_starts_on_saturday(self):
+        saturday = datetime.date(2025, 10, 18)
+        self.assertEqual({rollups.week_start(saturday + datetime.timedelta(days=offset)) for offset in range(7)}, {saturday})
+        self.assertEqual(jalali.format(saturday), "1404/07/26")
+
+    def test_stop_updates_day_and_week(self):
+        self.finish(25, completed=True)
+        self.finish(50, completed=False)
+        today = timezone.localdate()
+        self.assertEqual(self.totals(), {("day", today): (2, 1, 25), ("week", rollups.week_start(today)): (2, 1, 25)})
+
+    def test_stats_are_served_from_rollups(self):
+        self.finish(25, completed=True)
+        with self.assertNumQueries(1):
+            stats = self.client.get("/stats/data/").json()
+        self.assertEqual([stats["days"][0]["completed_minutes"], stats["days"][0]["completion_rate"]], [25, 1.0])
+        self.assertEqual(len(stats["weeks"]), 1)
+        self.assertContains(self.client.get("/stats/"), stats["days"][0]["jalali"])
+
+    def test_malformed_stats_params_fall_back_to_defaults(self):
+        self.finish(25, completed=True)
+        self.assertEqual(self.client.get("/stats/?days=abc&weeks=").status_code, 200)
+        stats = self.client.get("/stats/data/?days=abc&weeks=1.5").json()
+        self.assertTrue(stats["success"])
+        self.assertEqual(stats, self.client.get("/stats/data/").json())
+
+    def test_rebuild_matches_incremental_updates(self):
+        self.finish(25, completed=True)
+        start = timezone.now() - datetime.timedelta(days=9)
+        for days in range(5):
+            log = PomodoroLog.objects.create(session_name="Old", duration_minutes=30, start_time=start + datetime.timedelta(days=days), end_time=start + datetime.timedelta(days=days, minutes=30), completed=days % 2 == 0)
+            rollups.record(log)
+        expected = self.totals()
+
+        FocusRollup.objects.all().delete()
+        call_command("rebuild_rollups", chunk_size=2, stdout=io.StringIO())
+        self.assertEqual(self.totals(), expected)
+
+    def test_deleted_logs_leave_the_rollups(self):
+        kept = self.finish(25, completed=True)
+        deleted = self.finish(50, completed=True)
+        self.finish(10, completed=False)
+        PomodoroLog.objects.get(pk=deleted["log_id"]).delete()
+        PomodoroLog.objects.exclude(pk=kept["log_id"]).delete()
+        today = timezone.localdate()
+        self.assertEqual(self.totals(), {("day", today): (1, 1, 25), ("week", rollups.week_start(today)): (1, 1, 25)})
+
+
+SEED_SQL = {
+    "postgresql": [
+        "INSERT INTO pomodoro_pomodorosession (duration_minutes, session_name, start_time, end_time, is_active, is_paused, total_paused_duration) SELECT 25, 'Seed', now() - i * interval '30 minutes', now() - i * interval '30 minutes' + interval '25 minutes', false, false, interval '0' FROM generate_series(1, %(rows)s) AS i",
+        "INSERT INTO pomodoro_pomodorolog (session_name, duration_minutes, start_time, end_time, completed, created_at) SELECT 'Seed', 25, now() - i * interval '30 minutes', now() - i * interval '30 minutes' + interval '25 minutes', true, now() - i * interval '30 minutes' FROM generate_series(1, %(rows)s) AS i",
+        "ANALYZE pomodoro_pomodorosession",
+        "ANALYZE pomodoro_pomodorolog",
+    ],
+    "sqlite": [
+        "WITH RECURSIVE seq(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM seq WHERE i < %(rows)s) INSERT INTO pomodoro_pomodorosession (duration_minutes, session_name, start_time, end_time, is_active, is_paused, total_paused_duration) SELECT 25, 'Seed', datetime('now', (-30 * i) || ' minutes'), datetime('now', (25 - 30 * i) || ' minutes'), 0, 0, 0 FROM seq",
+        "WITH RECURSIVE seq(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM seq WHERE i < %(rows)s) INSERT INTO pomodoro_pomodorolog (session_name, duration_minutes, start_time, end_time, completed, created_at) SELECT 'Seed', 25, datetime('now', (-30 * i) || ' minutes'), datetime('now', (25 - 30 * i) || ' minutes'), 1, datetime('now', (-30 * i) || ' minutes') FROM seq",
+        "ANALYZE",
+    ],
+}
+
+# Plan lines that read a whole table instead of an index.
+FULL_SCAN = {"postgresql": re.compile(r"Seq Scan"), "sqlite": re.compile(r"\bSCAN \S+$", re.MULTILINE)}
+
+
+class IndexTests(TestCase):
+    rows = 1_000_000
+
+    @classmethod
+    def setUpTestData(cls):
+        if connection.vendor not in SEED_SQL:
+            raise unittest.SkipTest(f"No seed SQL for {connection.vendor}")
+        with connection.cursor() as cursor:
+            for sql in SEED_SQL[connection.vendor]:
+                cursor.execute(sql % {"rows": cls.rows})
+        PomodoroSession.objects.create(session_name="Active")
+
+    def assertIndexBacked(self, queryset):
+        plan = queryset.explain()
+        self.assertRegex(plan, re.compile("index", re.IGNORECASE))
+        self.assertNotRegex(plan, FULL_SCAN[connection.vendor])
+
+    def test_hot_queries_are_index_backed(self):
+        queries = {
+            "status": PomodoroSession.objects.filter(is_active=True)[:1],
+            "recent logs": PomodoroLog.objects.all()[:10],
+            "user sessions": PomodoroSession.objects.filter(user_id=1)[:10],
+            "user logs": PomodoroLog.objects.filter(user_id=1)[:10],
+        }
+        for name, queryset in queries.items():
+            with self.subTest(name):
+                self.assertIndexBacked(queryset)
+
+    def test_one_active_session_per_user(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            PomodoroSession.objects.create(session_name="Second")
+
+
+class TransitionTests(PomodoroTestCase):
+    def queries(self, url, **data):
+        """Statements a transition sends, on-commit refresh included, leaving out the test transaction's savepoints."""
+        with CaptureQueriesContext(connection) as context, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, json.dumps(data), content_type="application/json").json()
+        return response, [query["sql"].split()[0] for query in context.captured_queries if not query["sql"].startswith(("SAVEPOINT", "RELEASE SAVEPOINT"))]
+
+    def test_pause_resume_and_rename_are_single_updates(self):
+        session_id = self.start()["session_id"]
+        for url, data in [("/pause/", {}), ("/resume/", {}), ("/update-session-name/", {"session_name": "Renamed"})]:
+            with self.subTest(url):
+                response, queries = self.queries(url, session_id=session_id, **data)
+                self.assertTrue(response["success"])
+                # The UPDATE, then one refresh of the cached state after commit.
+                self.assertEqual(queries, ["UPDATE", "SELECT"])
+
+    def test_start_and_stop_refresh_the_state_once(self):
+        response, queries = self.queries("/start/", duration=25, session_name="Focus")
+        self.assertEqual(queries, ["UPDATE", "INSERT", "SELECT"])
+        self.assertEqual(state.get_active()["session_id"], response["session_id"])
+        _, queries = self.queries("/stop/", session_id=response["session_id"], completed=True)
+        self.assertEqual(queries.count("SELECT"), 2)
+        self.assertIsNone(state.get_active())
+
+    def test_resume_adds_the_paused_time(self):
+        session_id = self.start()["session_id"]
+        self.post("/pause/", session_id=session_id)
+        PomodoroSession.objects.filter(pk=session_id).update(paused_at=timezone.now() - datetime.timedelta(minutes=5))
+        self.post("/resume/", session_id=session_id)
+        session = PomodoroSession.objects.get(pk=session_id)
+        self.assertAlmostEqual(session.total_paused_duration.total_seconds(), 300, delta=5)
+        self.assertEqual([session.is_paused, session.paused_at], [False, None])
+
+    def test_rejected_transitions_explain_why(self):
+        session_id = self.start()["session_id"]
+        self.assertEqual(self.post("/resume/", session_id=session_id)["error"], "Timer is not paused")
+        self.post("/pause/", session_id=session_id)
+        self.assertEqual(self.post("/pause/", session_id=session_id)["error"], "Timer is already paused")
+        self.post("/stop/", session_id=session_id)
+        self.assertEqual(self.post("/pause/", session_id=session_id)["error"], "No PomodoroSession matches the given query.")
+
+    def test_stop_while_paused_counts_the_pause(self):
+        session_id = self.start()["session_id"]
+        self.post("/pause/", session_id=session_id)
+        PomodoroSession.objects.filter(pk=session_id).update(paused_at=timezone.now() - datetime.timedelta(minutes=2))
+        self.post("/stop/", session_id=session_id)
+        self.assertAlmostEqual(PomodoroSession.objects.get(pk=session_id).total_paused_duration.total_seconds(), 120, delta=5)
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "Needs concurrent writers; SQLite serializes them.")
+class ConcurrentTransitionTests(TransactionTestCase):
+    workers = 16
+    transitions = 3000
+
+    def worker(self, seed, successes, lock):
+        rng = random.Random(seed)
+        client = Client()
+        try:
+            for _ in range(self.transitions // self.workers):
+                url = rng.choice(["/start/", "/pause/", "/resume/", "/pause/", "/resume/", "/update-session-name/", "/stop/"])
+                session = PomodoroSession.objects.filter(is_active=True).values_list("pk", flat=True).first()
+                data = {"session_id": session, "session_name": f"Tab {seed}", "duration": 25}
+                response = client.post(url, json.dumps(data), content_type="application/json").json()
+                if response["success"]:
+                    with lock:
+                        successes[url, response.get("session_id", session)] += 1
+        finally:
+            connection.close()
+
+    def test_interleaved_transitions_keep_invariants(self):
+        state.get_cache().clear()
+        successes, lock = Counter(), threading.Lock()
+        threads = [threading.Thread(target=self.worker, args=(seed, successes, lock)) for seed in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        sessions = list(PomodoroSession.objects.all())
+        self.assertLessEqual(sum(session.is_active for session in sessions), 1)
+        stops = sum(count for (url, _), count in successes.items() if url == "/stop/")
+        self.assertEqual(PomodoroLog.objects.count(), stops)
+        for session in sessions:
+            self.assertEqual(session.is_paused, session.paused_at is not None)
+            self.assertGreaterEqual(session.total_paused_duration, datetime.timedelta(0))
+            # Every accepted pause is matched by a resume unless the session is still paused.
+            self.assertEqual(successes["/pause/", session.pk] - successes["/resume/", session.pk], int(session.is_paused))
+            if not session.is_active and session.end_time:
+                # Each request reads the clock before it gets the row, so allow a little skew.
+                self.assertLessEqual(session.total_paused_duration, session.end_time - session.start_time + datetime.timedelta(seconds=1))
+        self.assertEqual(state.get_active(), state.load())
+
+
+class BatchTests(PomodoroTestCase):
+    def batch(self, *operations):
+        return self.post("/batch/", operations=list(operations))
+
+    def test_offline_queue_replays_in_order(self):
+        response = self.batch(
+            {"action": "start", "duration": 25, "session_name": "Offline"},
+            {"action": "pause"},
+            {"action": "resume"},
+            {"action": "update_session_name", "session_name": "Synced"},
+            {"action": "stop", "completed": True},
+            {"action": "start", "duration": 50},
+        )
+        self.assertTrue(all(result["success"] for result in response["results"]), response)
+        first, second = response["results"][0]["session_id"], response["results"][-1]["session_id"]
+        self.assertEqual(response["results"][4]["session_id"], first)
+        self.assertEqual(PomodoroLog.objects.get().session_name, "Synced")
+        self.assertEqual(state.get_active()["session_id"], second)
+
+    def test_failed_operations_are_reported_and_rolled_back_alone(self):
+        session_id = self.start()["session_id"]
+        response = self.batch(
+            {"action": "resume", "session_id": session_id},
+            {"action": "update_session_name", "session_id": session_id, "session_name": "Kept"},
+            {"action": "explode"},
+            {"action": "start", "duration": "soon"},
+        )
+        self.assertEqual([result["success"] for result in response["results"]], [False, True, False, False])
+        self.assertEqual(response["results"][0]["error"], "Timer is not paused")
+        self.assertEqual(PomodoroSession.objects.get(is_active=True).session_name, "Kept")
+
+    def test_log_renames_are_one_bulk_update(self):
+        logs = [PomodoroLog.objects.create(session_name=f"Log {i}", duration_minutes=25, start_time=timezone.now(), end_time=timezone.now()) for i in range(3)]
+        operations = [{"action": "update_log_name", "log_id": log.pk, "session_name": f"Renamed {log.pk}"} for log in logs] + [{"action": "update_log_name", "log_id": 0, "session_name": "Missing"}]
+        with CaptureQueriesContext(connection) as context:
+            response = self.batch(*operations)
+        queries = [query["sql"] for query in context.captured_queries if not query["sql"].startswith(("SAVEPOINT", "RELEASE SAVEPOINT"))]
+        self.assertEqual(len(queries), 2)
+        self.assertEqual([result["success"] for result in response["results"]], [True, True, True, False])
+        self.assertEqual(sorted(PomodoroLog.objects.values_list("session_name", flat=True)), [f"Renamed {log.pk}" for log in logs])
+
+    def test_log_ids_are_converted_and_checked_per_operation(self):
+        logs = [PomodoroLog.objects.create(session_name=f"Log {i}", duration_minutes=25, start_time=timezone.now(), end_time=timezone.now()) for i in range(2)]
+        response = self.batch(
+            {"action": "update_log_name", "log_id": str(logs[0].pk), "session_name": "From string"},
+            {"action": "update_log_name", "log_id": "x", "session_name": "Bad"},
+            {"action": "update_log_name", "log_id": logs[1].pk, "session_name": "From int"},
+        )
+        self.assertEqual([result["success"] for result in response["results"]], [True, False, True])
+        self.assertIn("expected a number", response["results"][1]["error"])
+        self.assertEqual(sorted(PomodoroLog.objects.values_list("session_name", flat=True)), ["From int", "From string"])
+
+    def test_invalid_names_fail_only_their_operation(self):
+        logs = [PomodoroLog.objects.create(session_name=f"Log {i}", duration_minutes=25, start_time=timezone.now(), end_time=timezone.now()) for i in range(4)]
+        response = self.batch(
+            {"action": "update_log_name", "log_id": logs[0].pk},
+            {"action": "update_log_name", "log_id": logs[1].pk, "session_name": None},
+            {"action": "update_log_name", "log_id": logs[2].pk, "session_name": "x" * 201},
+            {"action": "update_log_name", "log_id": logs[3].pk, "session_name": "Renamed"},
+        )
+        self.assertEqual([result["success"] for result in response["results"]], [False, False, False, True])
+        self.assertEqual(response["results"][0]["error"], "This field cannot be null.")
+        self.assertIn("at most 200 characters", response["results"][2]["error"])
+        self.assertEqual(list(PomodoroLog.objects.order_by("pk").values_list("session_name", flat=True)), ["Log 0", "Log 1", "Log 2", "Renamed"])
+
+    @override_settings(POMODORO_BATCH_MAX_OPERATIONS=2)
+    def test_batch_size_is_limited(self):
+        response = self.batch(*[{"action": "pause"}] * 3)
+        self.assertEqual(response, {"success": False, "error": "At most 2 operations per batch"})
+
+
+class JalaliTests(TestCase):
+    def setUp(self):
+        jalali.cache_clear()
+
+    def test_filters_match_datetime2jalali(self):
+        value = timezone.now()
+        for name, format_string in [("jalali_date", "%Y/%m/%d"), ("jalali_datetime", "%Y/%m/%d %H:%M"), ("jalali_time", "%H:%M")]:
+            with self.subTest(name):
+                self.assertEqual(getattr(pomodoro_extras, name)(value, format_string), datetime2jalali(value).strftime(format_string))
+        self.assertEqual(pomodoro_extras.jalali_date(None), "")
+
+    def test_conversions_are_shared_across_formats(self):
+        value = timezone.now()
+        jalali.format(value, "%Y/%m/%d")
+        jalali.format(value, "%H:%M")
+        jalali.format(value, "%H:%M")
+        self.assertEqual(jalali._convert.cache_info().misses, 1)
+        self.assertEqual(jalali._format.cache_info().hits, 1)
+
+    def test_cache_respects_the_active_time_zone(self):
+        value = datetime.datetime(2025, 3, 20, 22, 0, tzinfo=datetime.timezone.utc)
+        self.assertEqual(jalali.format(value, "%Y/%m/%d %H:%M"), "1404/01/01 01:30")
+        with timezone.override("UTC"):
+            self.assertEqual(jalali.format(value, "%Y/%m/%d %H:%M"), "1403/12/30 22:00")
+
+    def test_format_many(self):
+        values = [timezone.now() - datetime.timedelta(days=day) for day in range(3)] + [None]
+        self.assertEqual(jalali.format_many(values, "%Y/%m/%d"), [jalali.format(value, "%Y/%m/%d") for value in values])
+
+    def test_benchmark_command(self):
+        out = io.StringIO()
+        call_command("benchmark_jalali", rows=10, repeat=1, stdout=out)
+        self.assertEqual(out.getvalue().count("per 1,000 rows"), 4)
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.logs = [PomodoroLog.objects.create(session_name=f"جلسه {i}", duration_minutes=25, start_time=now - datetime.timedelta(hours=i), end_time=now - datetime.timedelta(hours=i, minutes=-25), completed=i % 2 == 0) for i in range(5)]
+
+    def read(self, response):
+        content = b"".join(response.streaming_content)
+        return gzip.decompress(content).decode() if response.get("Content-Encoding") == "gzip" else content.decode()
+
+    @override_settings(POMODORO_EXPORT_CHUNK_SIZE=2)
+    def test_csv_export_streams_every_row_with_jalali_dates(self):
+        response = self.client.get("/export/")
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        rows = list(csv.DictReader(io.StringIO(self.read(response))))
+        self.assertEqual([int(row["id"]) for row in rows], sorted(log.pk for log in self.logs))
+        self.assertEqual(rows[0]["start_jalali"], pomodoro_extras.jalali_datetime(self.logs[0].start_time))
+        self.assertEqual(rows[0]["session_name"], "جلسه 0")
+
+    def test_jsonl_export_is_gzipped_when_accepted(self):
+        response = self.client.get("/export/?format=jsonl", headers={"accept-encoding": "gzip, deflate"})
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[-1]["end_jalali"], pomodoro_extras.jalali_datetime(self.logs[-1].end_time))
+
+    def test_gzip_follows_q_values(self):
+        for header, gzipped in [("gzip;q=0", False), ("deflate, gzip ; q=0.0", False), ("br;q=1, gzip;q=0.5", True), ("*", True), ("*, gzip;q=0", False), ("identity", False), ("xgzip", False)]:
+            response = self.client.get("/export/", headers={"accept-encoding": header})
+            self.assertEqual(response.get("Content-Encoding") == "gzip", gzipped, header)
+
+    def test_unknown_format(self):
+        self.assertEqual(self.client.get("/export/?format=xml").status_code, 400)
+
+    def test_command_writes_gzipped_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "logs.jsonl.gz")
+            call_command("export_logs", format="jsonl", output=path, chunk_size=2)
+            with gzip.open(path, "rt", encoding="utf-8") as stream:
+                self.assertEqual(len(stream.readlines()), 5)
+        out = io.StringIO()
+        call_command("export_logs", stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 6)
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        for days in [400, 390, 380, 10, 0]:
+            log = PomodoroLog.objects.create(session_name=f"{days} days ago", duration_minutes=25, start_time=now - datetime.timedelta(days=days), end_time=now - datetime.timedelta(days=days, minutes=-25), completed=days != 390)
+            PomodoroLog.objects.filter(pk=log.pk).update(created_at=log.start_time)
+            rollups.record(log)
+        self.rollups = sorted(FocusRollup.objects.values_list("period", "period_start", "sessions", "completed_sessions", "completed_minutes"))
+
+    def assertRollupsRebuild(self):
+        # Archiving leaves the rollups alone, and rebuilding them from the archive gives the same totals.
+        self.assertEqual(sorted(FocusRollup.objects.values_list("period", "period_start", "sessions", "completed_sessions", "completed_minutes")), self.rollups)
+        rollups.rebuild(chunk_size=2)
+        self.assertEqual(sorted(FocusRollup.objects.values_list("period", "period_start", "sessions", "completed_sessions", "completed_minutes")), self.rollups)
+
+    def test_table_backend_moves_old_logs_in_chunks(self):
+        moved = list(archive.run(days=365, backend="table", chunk_size=2))
+        self.assertEqual(moved, [2, 1])
+        self.assertEqual(sorted(PomodoroLog.objects.values_list("session_name", flat=True)), ["0 days ago", "10 days ago"])
+        self.assertEqual(ArchivedLog.objects.count(), 3)
+        self.assertRollupsRebuild()
+
+    def test_runs_are_incremental(self):
+        self.assertEqual(list(archive.run(days=365, backend="table", chunk_size=1, max_chunks=2)), [1, 1])
+        self.assertEqual(list(archive.run(days=365, backend="table", chunk_size=1)), [1])
+        self.assertEqual(list(archive.run(days=365, backend="table")), [])
+
+    def test_files_backend_writes_gzipped_jsonl(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(POMODORO_ARCHIVE_DIR=directory):
+            out = io.StringIO()
+            call_command("archive_logs", older_than_days=365, backend="files", chunk_size=2, stdout=out)
+            self.assertIn("Archived 3 logs in total", out.getvalue())
+            self.assertEqual(len(os.listdir(directory)), 2)
+            self.assertEqual(sorted(row["session_name"] for row in archive.file_rows()), ["380 days ago", "390 days ago", "400 days ago"])
+            self.assertEqual(PomodoroLog.objects.count(), 2)
+            self.assertRollupsRebuild()
+
+
+@override_settings(POMODORO_STREAM_HEARTBEAT=0.01)
+class AsyncViewTests(PomodoroTestCase):
+    factory = AsyncRequestFactory()
+
+    async def call(self, view, **data):
+        return json.loads((await view(self.factory.post("/", json.dumps(data), content_type="application/json"))).content)
+
+    async def status(self):
+        return json.loads((await async_views.get_timer_status(self.factory.get("/"))).content)
+
+    async def test_status_matches_the_sync_view(self):
+        session_id = (await self.call(async_views.start_timer, duration=5))["session_id"]
+        await sync_to_async(state.refresh)()
+        status = await self.status()
+        self.assertEqual(status["session_id"], session_id)
+        self.assertEqual(status, await sync_to_async(lambda: self.client.get("/status/").json())())
+
+    async def test_transitions_use_the_async_orm(self):
+        session_id = (await self.call(async_views.start_timer))["session_id"]
+        self.assertTrue((await self.call(async_views.pause_timer, session_id=session_id))["success"])
+        self.assertTrue((await self.status())["is_paused"])
+        self.assertEqual((await self.call(async_views.pause_timer, session_id=session_id))["error"], "Timer is already paused")
+        self.assertTrue((await self.call(async_views.resume_timer, session_id=session_id))["success"])
+        self.assertTrue((await self.call(async_views.update_session_name, session_id=session_id, session_name="Async"))["success"])
+        self.assertEqual((await self.status())["session_name"], "Async")
+
+    async def test_stream_pushes_transitions_without_a_thread(self):
+        session_id = (await self.call(async_views.start_timer))["session_id"]
+        await sync_to_async(state.refresh)()
+        stream = (await async_views.stream_timer_status(self.factory.get("/"))).streaming_content
+
+        async def read_event():
+            async for chunk in stream:
+                if chunk.startswith(b"data: "):
+                    return json.loads(chunk[len("data: "):])
+
+        self.assertEqual((await read_event())["event"], "snapshot")
+        await self.call(async_views.pause_timer, session_id=session_id)
+        event = await read_event()
+        self.assertEqual([event["event"], event["is_paused"]], ["pause", True])
+        await stream.aclose()
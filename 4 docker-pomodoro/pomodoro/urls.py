@@ -1,13 +1,22 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
+
+# The ASGI deployment serves status and transitions from the async views.
+timer_views = async_views if settings.POMODORO_ASYNC_VIEWS else views
 
 urlpatterns = [
     path('', views.pomodoro_timer, name='pomodoro_timer'),
-    path('start/', views.start_timer, name='start_timer'),
-    path('pause/', views.pause_timer, name='pause_timer'),
-    path('resume/', views.resume_timer, name='resume_timer'),
-    path('stop/', views.stop_timer, name='stop_timer'),
-    path('update-session-name/', views.update_session_name, name='update_session_name'),
+    path('start/', timer_views.start_timer, name='start_timer'),
+    path('pause/', timer_views.pause_timer, name='pause_timer'),
+    path('resume/', timer_views.resume_timer, name='resume_timer'),
+    path('stop/', timer_views.stop_timer, name='stop_timer'),
+    path('update-session-name/', timer_views.update_session_name, name='update_session_name'),
     path('update-log-name/', views.update_log_name, name='update_log_name'),
-    path('status/', views.get_timer_status, name='get_timer_status'),
+    path('batch/', views.batch_actions, name='batch_actions'),
+    path('status/', timer_views.get_timer_status, name='get_timer_status'),
+    path('status/stream/', timer_views.stream_timer_status, name='stream_timer_status'),
+    path('stats/', views.pomodoro_stats, name='pomodoro_stats'),
+    path('stats/data/', views.get_stats, name='get_stats'),
+    path('export/', views.export_logs, name='export_logs'),
 ]
@@ -1,12 +1,43 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.utils import timezone
 from django.contrib import messages
-from django.db import transaction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
 import json
+from .events import status_payload, stream
+from . import actions, export, rollups
 from .models import PomodoroSession, PomodoroLog
+from .state import get_active
+
+
+def accepts_gzip(request):
+    """Whether Accept-Encoding allows gzip, directly or through "*", with a q-value above zero."""
+    qualities = {}
+    for item in request.headers.get("Accept-Encoding", "").split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    return qualities.get("gzip", qualities.get("x-gzip", qualities.get("*", 0.0))) > 0
+
+
+def run_action(request, action):
+    try:
+        data = json.loads(request.body)
+        return JsonResponse(action(data))
+
+    except Exception as e:
+        return JsonResponse({"success": False, "error": str(e)})
 
 
 def pomodoro_timer(request):
@@ -23,154 +54,115 @@ def pomodoro_timer(request):
 @csrf_exempt
 @require_http_methods(["POST"])
 def start_timer(request):
-    try:
-        data = json.loads(request.body)
-        duration = int(data.get("duration", 25))
-        session_name = data.get("session_name", "جلسه مطالعه")
-        PomodoroSession.objects.filter(is_active=True).update(is_active=False, end_time=timezone.now())
-        session = PomodoroSession.objects.create(duration_minutes=duration, session_name=session_name, is_active=True, is_paused=False)
-
-        return JsonResponse({"success": True, "session_id": session.id, "duration": duration, "session_name": session_name, "start_time": session.start_time.isoformat()})
-
-    except Exception as e:
-        return JsonResponse({"success": False, "error": str(e)})
+    return run_action(request, actions.start)
 
 
 @csrf_exempt
 @require_http_methods(["POST"])
 def pause_timer(request):
-    try:
-        data = json.loads(request.body)
-        session_id = data.get("session_id")
-
-        session = get_object_or_404(PomodoroSession, id=session_id, is_active=True)
-
-        if not session.is_paused:
-            session.is_paused = True
-            session.paused_at = timezone.now()
-            session.save()
-
-            return JsonResponse({"success": True, "is_paused": True, "paused_at": session.paused_at.isoformat()})
-        else:
-            return JsonResponse({"success": False, "error": "Timer is already paused"})
-
-    except Exception as e:
-        return JsonResponse({"success": False, "error": str(e)})
+    return run_action(request, actions.pause)
 
 
 @csrf_exempt
 @require_http_methods(["POST"])
 def resume_timer(request):
-    try:
-        data = json.loads(request.body)
-        session_id = data.get("session_id")
+    return run_action(request, actions.resume)
 
-        session = get_object_or_404(PomodoroSession, id=session_id, is_active=True)
 
-        if session.is_paused:
-            if session.paused_at:
-                paused_duration = timezone.now() - session.paused_at
-                session.total_paused_duration += paused_duration
+@csrf_exempt
+@require_http_methods(["POST"])
+def stop_timer(request):
+    return run_action(request, actions.stop)
 
-            session.is_paused = False
-            session.paused_at = None
-            session.save()
 
-            return JsonResponse({"success": True, "is_paused": False, "resumed_at": timezone.now().isoformat()})
-        else:
-            return JsonResponse({"success": False, "error": "Timer is not paused"})
+@csrf_exempt
+@require_http_methods(["POST"])
+def update_session_name(request):
+    return run_action(request, actions.update_session_name)
 
-    except Exception as e:
-        return JsonResponse({"success": False, "error": str(e)})
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def update_log_name(request):
+    return run_action(request, actions.update_log_name)
 
 
 @csrf_exempt
 @require_http_methods(["POST"])
-def stop_timer(request):
+def batch_actions(request):
+    """Apply an ordered list of actions in one transaction, e.g. a queue an offline client is syncing."""
     try:
         data = json.loads(request.body)
-        session_id = data.get("session_id")
-        completed = data.get("completed", False)
-
-        session = get_object_or_404(PomodoroSession, id=session_id, is_active=True)
-
-        if session.is_paused and session.paused_at:
-            paused_duration = timezone.now() - session.paused_at
-            session.total_paused_duration += paused_duration
+        operations = data.get("operations")
+        if not isinstance(operations, list):
+            return JsonResponse({"success": False, "error": "operations must be a list"})
+        if len(operations) > settings.POMODORO_BATCH_MAX_OPERATIONS:
+            return JsonResponse({"success": False, "error": f"At most {settings.POMODORO_BATCH_MAX_OPERATIONS} operations per batch"})
 
-        session.is_active = False
-        session.end_time = timezone.now()
-        session.save()
-
-        log_entry = PomodoroLog.objects.create(session_name=session.session_name, duration_minutes=session.duration_minutes, start_time=session.start_time, end_time=session.end_time, completed=completed)
-
-        return JsonResponse({"success": True, "session_id": session.id, "log_id": log_entry.id, "end_time": session.end_time.isoformat(), "completed": completed})
+        results = actions.run_batch(operations)
+        return JsonResponse({"success": True, "results": results})
 
     except Exception as e:
         return JsonResponse({"success": False, "error": str(e)})
 
 
-@csrf_exempt
-@require_http_methods(["POST"])
-def update_session_name(request):
+def get_timer_status(request):
     try:
-        data = json.loads(request.body)
-        session_id = data.get("session_id")
-        new_name = data.get("session_name")
-
-        session = get_object_or_404(PomodoroSession, id=session_id, is_active=True)
-        session.session_name = new_name
-        session.save()
-
-        return JsonResponse({"success": True, "session_name": new_name})
+        return JsonResponse(status_payload(get_active()))
 
     except Exception as e:
         return JsonResponse({"success": False, "error": str(e)})
 
 
-@csrf_exempt
-@require_http_methods(["POST"])
-def update_log_name(request):
+def stream_timer_status(request):
+    """Server-Sent Events stream of timer state transitions, replacing /status/ polling."""
+    response = StreamingHttpResponse(stream(get_active), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def int_param(request, name, default, maximum):
+    """A query parameter clamped to 1..maximum; the default when missing or not a number."""
     try:
-        data = json.loads(request.body)
-        log_id = data.get("log_id")
-        new_name = data.get("session_name")
+        value = int(request.GET.get(name, default))
+    except ValueError:
+        value = default
+    return min(max(value, 1), maximum)
 
-        log_entry = get_object_or_404(PomodoroLog, id=log_id)
-        log_entry.session_name = new_name
-        log_entry.save()
 
-        return JsonResponse({"success": True, "session_name": new_name})
+def stats_params(request):
+    return int_param(request, "days", 14, 366), int_param(request, "weeks", 8, 53)
 
-    except Exception as e:
-        return JsonResponse({"success": False, "error": str(e)})
 
+def pomodoro_stats(request):
+    days, weeks = stats_params(request)
+    stats = rollups.stats(days=days, weeks=weeks)
+    return render(request, "pomodoro/stats.html", {"sections": [("روزانه", stats["days"]), ("هفتگی", stats["weeks"])]})
 
-def get_timer_status(request):
+
+def get_stats(request):
+    """Focus time per Jalali day and week, served from the precomputed rollups."""
     try:
-        active_session = PomodoroSession.objects.filter(is_active=True).first()
-
-        if not active_session:
-            return JsonResponse({"success": True, "active": False})
-
-        remaining = active_session.remaining_time
-        total_seconds = int(remaining.total_seconds())
-        minutes = total_seconds // 60
-        seconds = total_seconds % 60
-
-        return JsonResponse(
-            {
-                "success": True,
-                "active": True,
-                "session_id": active_session.id,
-                "session_name": active_session.session_name,
-                "duration_minutes": active_session.duration_minutes,
-                "remaining_minutes": minutes,
-                "remaining_seconds": seconds,
-                "is_paused": active_session.is_paused,
-                "start_time": active_session.start_time.isoformat(),
-            }
-        )
+        days, weeks = stats_params(request)
+        return JsonResponse({"success": True, **rollups.stats(days=days, weeks=weeks)})
 
     except Exception as e:
         return JsonResponse({"success": False, "error": str(e)})
+
+
+@require_http_methods(["GET"])
+def export_logs(request):
+    """Stream the whole log history as CSV or JSON Lines, gzipped on the fly when the client accepts it."""
+    export_format = request.GET.get("format", "csv")
+    if export_format not in export.FORMATS:
+        return JsonResponse({"success": False, "error": f"Unknown format: {export_format}"}, status=400)
+
+    content = (chunk.encode() for chunk in export.export(export_format, chunk_size=settings.POMODORO_EXPORT_CHUNK_SIZE))
+    gzipped = accepts_gzip(request)
+    response = StreamingHttpResponse(compress_sequence(content) if gzipped else content, content_type=export.CONTENT_TYPES[export_format])
+    if gzipped:
+        response["Content-Encoding"] = "gzip"
+    patch_vary_headers(response, ["Accept-Encoding"])
+    response["Content-Disposition"] = f'attachment; filename="pomodoro-logs.{export_format}"'
+    return response
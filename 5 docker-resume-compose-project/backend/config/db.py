@@ -0,0 +1,62 @@
+import threading
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+_opened = 0
+_lock = threading.Lock()
+
+
+def count_connection(sender, connection, **kwargs):
+    global _opened
+    with _lock:
+        _opened += 1
+
+
+connection_created.connect(count_connection, dispatch_uid="config_db_count_connection")
+
+
+def get_pool(alias="default"):
+    """The psycopg connection pool of `alias`, or None when pooling is off."""
+    return getattr(connections[alias], "pool", None)
+
+
+def warm_up(alias="default", timeout=10.0):
+    """
+    Open database connections before the first request: fill the pool up to its
+    min_size, or open this thread's persistent connection.
+    """
+    pool = get_pool(alias)
+    if pool is not None:
+        pool.open()
+        pool.wait(timeout=timeout)
+    else:
+        connections[alias].ensure_connection()
+
+
+def stats(alias="default"):
+    """Connection metrics of this process, including pool wait time and usage when pooling."""
+    settings_dict = connections[alias].settings_dict
+    pool = get_pool(alias)
+    if pool is not None:
+        mode = "pool"
+    elif settings_dict["CONN_MAX_AGE"] != 0:
+        mode = "persistent"
+    else:
+        mode = "per-request"
+
+    result = {
+        "vendor": connections[alias].vendor,
+        "mode": mode,
+        "conn_max_age": settings_dict["CONN_MAX_AGE"],
+        "conn_health_checks": settings_dict["CONN_HEALTH_CHECKS"],
+        # Django-level connections opened; in pool mode each checkout counts.
+        "connections_opened": _opened,
+    }
+    if pool is not None:
+        pool_stats = pool.get_stats()
+        result["pool"] = {
+            **pool_stats,
+            "connections_in_use": pool_stats.get("pool_size", 0) - pool_stats.get("pool_available", 0),
+        }
+    return result
@@ -62,6 +62,23 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Opt-in per-request timing: Server-Timing headers, JSON log lines and
+# per-route latency histograms at /api/metrics/timing/ (staff only).
+REQUEST_TIMING = os.getenv("REQUEST_TIMING", "False").lower() in ("true", "1", "yes")
+if REQUEST_TIMING:
+    MIDDLEWARE.insert(0, "resume.middleware.ServerTimingMiddleware")
+
+# Serve published snapshots of the read-only resume API from disk, bypassing
+# DRF and the database (see resume/snapshot.py). Edits republish it in a
+# background thread; `manage.py publish_snapshot` does it by hand.
+RESUME_SNAPSHOT = os.getenv("RESUME_SNAPSHOT", "False").lower() in ("true", "1", "yes")
+RESUME_SNAPSHOT_DIR = os.getenv("RESUME_SNAPSHOT_DIR", str(BASE_DIR / "snapshot"))
+# Scheme and host the snapshot is rendered for; it only answers requests to that host.
+RESUME_SNAPSHOT_BASE_URL = os.getenv("RESUME_SNAPSHOT_BASE_URL", "http://localhost:8000")
+RESUME_SNAPSHOT_BACKGROUND = True
+if RESUME_SNAPSHOT:
+    MIDDLEWARE.insert(MIDDLEWARE.index("corsheaders.middleware.CorsMiddleware") + 1, "resume.middleware.SnapshotMiddleware")
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
@@ -86,16 +103,74 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Connection reuse is configured next to DATABASE_URL:
+#   DB_CONN_MAX_AGE        seconds to keep a connection per worker thread (0 = per request, "None" = forever)
+#   DB_CONN_HEALTH_CHECKS  check persistent connections before reusing them
+#   DB_POOL                use a psycopg connection pool per process (Postgres only, needs psycopg[pool])
+#   DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE / DB_POOL_TIMEOUT
+# gunicorn.conf.py opens the connections when a worker starts (see config/db.py).
+
 print("Connecting to", "sqlite" if os.getenv("DATABASE_URL", None) is None else "postgres", "db")
+DB_CONN_MAX_AGE = os.getenv("DB_CONN_MAX_AGE", "0")
+DB_POOL = os.getenv("DB_POOL", "False").lower() in ("true", "1", "yes")
 DATABASES = {
     "default": dj_database_url.config(
         default=os.getenv(
             "DATABASE_URL",
             "sqlite:///" + str(BASE_DIR / "db.sqlite3"),
         ),
+        conn_max_age=None if DB_CONN_MAX_AGE.lower() == "none" else int(DB_CONN_MAX_AGE),
+        conn_health_checks=os.getenv("DB_CONN_HEALTH_CHECKS", "True").lower() in ("true", "1", "yes"),
     ),
 }
 
+if DB_POOL and DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+    # Pooled connections are returned to the pool after each request instead of being kept per thread.
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+        "min_size": int(os.getenv("DB_POOL_MIN_SIZE", 2)),
+        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", 10)),
+        "timeout": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+    }
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Local memory is per process, so with several gunicorn workers use a shared
+# backend, e.g. CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache
+# with CACHE_LOCATION pointing at a directory every worker can reach.
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    },
+}
+
+# Serialized resume API responses are cached under a content version that is
+# bumped whenever resume data changes (see resume/signals.py).
+RESUME_CACHE_ALIAS = "default"
+RESUME_CACHE_TIMEOUT = int(os.getenv("RESUME_CACHE_TIMEOUT", 60 * 60 * 24))
+
+# Render list and detail reads from `.values()` rows instead of through the
+# ModelSerializers (see resume.serializers.ValuesSerializer). Same JSON, less CPU.
+RESUME_FAST_SERIALIZERS = os.getenv("RESUME_FAST_SERIALIZERS", "False").lower() in ("true", "1", "yes")
+
+
+# Logging
+# https://docs.djangoproject.com/en/4.2/topics/logging/
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "resume": {"handlers": ["console"], "level": os.getenv("RESUME_LOG_LEVEL", "INFO")},
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -134,12 +209,33 @@ USE_TZ = True
 STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# collectstatic writes content-hashed names plus gzip/brotli variants, which
+# config.static.serve sends with immutable cache headers when DEBUG is off.
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "config.storage.CompressedManifestStaticFilesStorage",
+    },
+}
+
+# Set to False when a web server or CDN serves STATIC_ROOT and MEDIA_ROOT.
+SERVE_STATIC = os.getenv("SERVE_STATIC", "True").lower() in ("true", "1", "yes")
+
 # Media files (User-uploaded content)
 # https://docs.djangoproject.com/en/4.2/topics/files/
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Resized copies of project images, generated off the request path by a
+# thread pool of RESUME_IMAGE_WORKERS threads (0 generates them inline).
+RESUME_IMAGE_WIDTHS = [320, 640, 1280]
+RESUME_IMAGE_FORMATS = ["avif", "webp"]
+RESUME_IMAGE_DERIVATIVES_DIR = "projects/derivatives"
+RESUME_IMAGE_WORKERS = int(os.getenv("RESUME_IMAGE_WORKERS", 2))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
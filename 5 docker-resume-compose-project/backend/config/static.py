@@ -0,0 +1,73 @@
+import mimetypes
+import os
+import re
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+# Names like app.3f2a1b9c4d5e.css (ManifestStaticFilesStorage) or
+# 0123456789abcdef-320w.webp (resume/images.py) never change content.
+HASHED_NAME = re.compile(r"(\.[0-9a-f]{12}\.|/[0-9a-f]{16}-\d+w\.)")
+
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+
+def accepted_encodings(header):
+    """Content codings of an Accept-Encoding header with a q-value above zero; "*" stands for any coding not listed."""
+    qualities = {}
+    for item in header.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.lower()] = quality
+    wildcard = qualities.pop("*", 0.0)
+    return {name for name, _ in ENCODINGS if qualities.get(name, wildcard) > 0}
+
+
+def serve(request, path, document_root, max_age=3600):
+    """
+    Production file serving for static and media files: precompressed variants
+    chosen by Accept-Encoding, long-lived immutable caching for content-hashed
+    names and FileResponse, which lets the WSGI server use sendfile.
+    """
+    try:
+        fullpath = safe_join(document_root, path)
+    except SuspiciousFileOperation:
+        raise Http404("Invalid path")
+    if not os.path.isfile(fullpath):
+        raise Http404("File not found")
+
+    stat = os.stat(fullpath)
+    if not was_modified_since(request.META.get("HTTP_IF_MODIFIED_SINCE"), stat.st_mtime):
+        return HttpResponseNotModified()
+
+    content_type, encoding = mimetypes.guess_type(fullpath)
+    served_path, content_encoding = fullpath, encoding
+    if encoding is None:
+        accepted = accepted_encodings(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        for name, suffix in ENCODINGS:
+            if name in accepted and os.path.isfile(fullpath + suffix):
+                served_path, content_encoding = fullpath + suffix, name
+                break
+
+    response = FileResponse(open(served_path, "rb"), content_type=content_type or "application/octet-stream")
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    if content_encoding:
+        response["Content-Encoding"] = content_encoding
+    patch_vary_headers(response, ["Accept-Encoding"])
+    if HASHED_NAME.search("/" + path):
+        response["Cache-Control"] = "public, max-age=31536000, immutable"
+    else:
+        response["Cache-Control"] = f"public, max-age={max_age}"
+    return response
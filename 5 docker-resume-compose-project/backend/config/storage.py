@@ -0,0 +1,45 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; only gzip variants are written without it
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (".css", ".js", ".mjs", ".map", ".json", ".svg", ".txt", ".html", ".xml", ".ico", ".eot", ".ttf", ".otf")
+
+
+def compress_file(path):
+    """Write .gz (and .br) variants of `path` next to it when they are smaller."""
+    with open(path, "rb") as f:
+        content = f.read()
+    variants = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(content, quality=11)
+    for suffix, compressed in variants.items():
+        if len(compressed) < len(content):
+            with open(path + suffix, "wb") as f:
+                f.write(compressed)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Manifest-hashed static files with gzip and brotli variants precomputed at
+    collectstatic time, served by config.static.serve.
+    """
+
+    # Fall back to the unhashed name instead of failing when collectstatic hasn't run.
+    manifest_strict = False
+
+    def post_process(self, paths, dry_run=False, **options):
+        names = set()
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            names.update(filter(None, [name, hashed_name]))
+            yield name, hashed_name, processed
+
+        if dry_run:
+            return
+        for name in sorted(names):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS) and self.exists(name):
+                compress_file(self.path(name))
@@ -17,10 +17,12 @@ Including another URLconf
 
 from django.contrib import admin
 from django.http import HttpResponse
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from .static import serve
+
 health_check = lambda request: HttpResponse("OK")
 
 urlpatterns = [
@@ -35,3 +37,9 @@ urlpatterns = [
 if settings.DEBUG:
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# and from Django itself in production, unless a web server or CDN does it
+elif settings.SERVE_STATIC:
+    urlpatterns += [
+        re_path(r"^%s(?P<path>.*)$" % settings.STATIC_URL.lstrip("/"), serve, {"document_root": settings.STATIC_ROOT}),
+        re_path(r"^%s(?P<path>.*)$" % settings.MEDIA_URL.lstrip("/"), serve, {"document_root": settings.MEDIA_ROOT}),
+    ]
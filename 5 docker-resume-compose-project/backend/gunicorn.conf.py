@@ -0,0 +1,15 @@
+import os
+
+bind = "0.0.0.0:8000"
+workers = int(os.getenv("GUNICORN_WORKERS", 3))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+
+
+def post_worker_init(worker):
+    # Open database connections (or fill the pool) before the first request arrives.
+    from config.db import warm_up
+
+    try:
+        warm_up()
+    except Exception:
+        worker.log.exception("Database warm-up failed")
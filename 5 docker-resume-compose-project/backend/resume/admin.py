@@ -1,9 +1,19 @@
 from django.contrib import admin
 from .models import Skill, Project, Experience, Education, Certification
+from .search import object_ids
+
+
+class SearchIndexAdminMixin:
+    """Changelist search through the full-text index (resume/search.py) instead of `icontains` scans over search_fields."""
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return queryset.filter(pk__in=object_ids(queryset.model, search_term)), False
 
 
 @admin.register(Skill)
-class SkillAdmin(admin.ModelAdmin):
+class SkillAdmin(SearchIndexAdminMixin, admin.ModelAdmin):
     list_display = ["name", "description", "created_at", "updated_at"]
     search_fields = ["name", "description"]
     list_filter = ["created_at", "updated_at"]
@@ -11,7 +21,7 @@ class SkillAdmin(admin.ModelAdmin):
 
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(SearchIndexAdminMixin, admin.ModelAdmin):
     list_display = ["title", "description", "production_link", "github_link", "image", "created_at", "updated_at"]
     search_fields = ["title", "description", "production_link", "github_link"]
     list_filter = ["created_at", "updated_at"]
@@ -19,7 +29,7 @@ class ProjectAdmin(admin.ModelAdmin):
 
 
 @admin.register(Experience)
-class ExperienceAdmin(admin.ModelAdmin):
+class ExperienceAdmin(SearchIndexAdminMixin, admin.ModelAdmin):
     list_display = ["position", "company", "start_date", "end_date", "is_current", "location"]
     search_fields = ["position", "company", "description", "location"]
     list_filter = ["is_current", "start_date", "created_at"]
@@ -28,7 +38,7 @@ class ExperienceAdmin(admin.ModelAdmin):
 
 
 @admin.register(Education)
-class EducationAdmin(admin.ModelAdmin):
+class EducationAdmin(SearchIndexAdminMixin, admin.ModelAdmin):
     list_display = ["degree", "institution", "field_of_study", "start_date", "end_date", "gpa"]
     search_fields = ["degree", "institution", "field_of_study", "description"]
     list_filter = ["start_date", "created_at"]
@@ -36,7 +46,7 @@ class EducationAdmin(admin.ModelAdmin):
 
 
 @admin.register(Certification)
-class CertificationAdmin(admin.ModelAdmin):
+class CertificationAdmin(SearchIndexAdminMixin, admin.ModelAdmin):
     list_display = ["name", "issuing_organization", "issue_date", "credential_id"]
     search_fields = ["name", "issuing_organization", "description", "credential_id"]
     list_filter = ["issue_date", "created_at"]
@@ -0,0 +1,172 @@
+import json
+import os
+from itertools import islice
+
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.models.constants import OnConflict
+from django.utils import timezone
+
+from .models import Skill, Project, Experience, Education, Certification
+
+# Insert order inside a batch: skills first, so the through rows of later models can point at them.
+MODELS = {f"resume.{model._meta.model_name}": model for model in [Skill, Project, Experience, Education, Certification]}
+M2M_MODELS = [Project, Experience]
+
+
+def iter_json_array(stream, chunk_size=1 << 16):
+    """Yield the objects of a top-level JSON array one at a time, reading `stream` in chunks."""
+    decoder = json.JSONDecoder()
+    buffer, pos, started = "", 0, False
+    while True:
+        # Skip whitespace and separators; the opening bracket comes once.
+        while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] == "," or (buffer[pos] == "[" and not started)):
+            started = started or buffer[pos] == "["
+            pos += 1
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+        try:
+            if pos == len(buffer):
+                raise ValueError
+            obj, end = decoder.raw_decode(buffer, pos)
+        except ValueError:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                if buffer[pos:].strip():
+                    raise ValueError(f"Truncated JSON array near: {buffer[pos:pos + 80]!r}")
+                return
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        yield obj
+        pos = end
+
+
+def iter_jsonl(stream):
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_records(stream, name):
+    """Records of a dumpdata-style fixture (`.json`) or of one-record-per-line JSON (`.jsonl`)."""
+    return iter_jsonl(stream) if name.endswith((".jsonl", ".ndjson")) else iter_json_array(stream)
+
+
+def columns(model):
+    """Fields written for `model`: every concrete field, minus the generated id of through tables."""
+    return [field for field in model._meta.concrete_fields if not (model._meta.auto_created and field.primary_key)]
+
+
+def build_row(model, fields, record, now, db):
+    """Database-ready values of one record, in `fields` order, without building a model instance."""
+    values = {**record["fields"], model._meta.pk.name: record["pk"]}
+    row = []
+    for field in fields:
+        if field.name in values:
+            value = field.to_python(values[field.name])
+        elif getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+            value = now
+        else:
+            value = field.get_default()
+        row.append(field.get_db_prep_save(value, db))
+    return row
+
+
+def copy_insert(table, fields, rows):
+    """
+    COPY the rows into a temporary table, then move them over with ON CONFLICT DO
+    NOTHING so a batch replayed after a failure doesn't trip on rows it already wrote.
+    """
+    quote = connection.ops.quote_name
+    names = ", ".join(quote(field.column) for field in fields)
+    temp = quote(f"import_{table}")
+    with connection.cursor() as cursor:
+        cursor.execute(f"CREATE TEMPORARY TABLE {temp} ON COMMIT DROP AS SELECT {names} FROM {quote(table)} WITH NO DATA")
+        with cursor.copy(f"COPY {temp} ({names}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+        cursor.execute(f"INSERT INTO {quote(table)} ({names}) SELECT {names} FROM {temp} ON CONFLICT DO NOTHING")
+        cursor.execute(f"DROP TABLE {temp}")
+
+
+def executemany_insert(table, fields, rows):
+    """Multi-row insert that skips rows already present, for databases without COPY."""
+    names = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+    insert = connection.ops.insert_statement(on_conflict=OnConflict.IGNORE)
+    suffix = connection.ops.on_conflict_suffix_sql(fields, OnConflict.IGNORE, None, None)
+    sql = f"{insert} {connection.ops.quote_name(table)} ({names}) VALUES ({', '.join(['%s'] * len(fields))}) {suffix}"
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def load_batch(records, use_copy, now):
+    """Insert one batch of records and their skill links in a single transaction. Returns rows per table label."""
+    rows = {label: [] for label in MODELS}
+    links = {model: [] for model in M2M_MODELS}
+    fields = {label: columns(model) for label, model in MODELS.items()}
+    # The connection itself rather than the thread-local proxy, which is slow to go through once per value.
+    db = connections[DEFAULT_DB_ALIAS]
+    for record in records:
+        label = record["model"]
+        model = MODELS[label]
+        rows[label].append(build_row(model, fields[label], record, now, db))
+        if model in links:
+            links[model].extend((record["pk"], skill_id) for skill_id in record["fields"].get("skills", []))
+
+    insert = copy_insert if use_copy else executemany_insert
+    counts = {}
+    with transaction.atomic():
+        for label, model in MODELS.items():
+            if rows[label]:
+                insert(model._meta.db_table, fields[label], rows[label])
+            counts[label] = len(rows[label])
+        for model, pairs in links.items():
+            through = model.skills.through
+            if pairs:
+                insert(through._meta.db_table, [through._meta.get_field(model._meta.model_name), through._meta.get_field("skill")], pairs)
+            counts[f"{model._meta.label_lower}.skills"] = len(pairs)
+    return counts
+
+
+def read_checkpoint(path):
+    try:
+        with open(path) as f:
+            return json.load(f)["records"]
+    except FileNotFoundError:
+        return 0
+
+
+def write_checkpoint(path, records):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"records": records}, f)
+    os.replace(tmp, path)
+
+
+def run(stream, name, batch_size=5000, checkpoint=None, start=0, use_copy=None):
+    """
+    Import resume records from `stream`, `batch_size` records per transaction,
+    skipping the first `start` records (those committed by an earlier run).
+    Records of other models are skipped. After each committed batch the record
+    offset is written to `checkpoint`. Yields (records read, rows inserted per label).
+    """
+    if use_copy is None:
+        use_copy = connection.vendor == "postgresql"
+    now = timezone.now()
+    records = islice(iter_records(stream, name), start, None)
+    position = start
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        counts = load_batch([record for record in batch if record.get("model") in MODELS], use_copy, now)
+        position += len(batch)
+        if checkpoint:
+            write_checkpoint(checkpoint, position)
+        yield position, counts
+
+    # Explicit primary keys don't advance PostgreSQL's id sequences.
+    models = list(MODELS.values()) + [model.skills.through for model in M2M_MODELS]
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), models):
+            cursor.execute(sql)
@@ -0,0 +1,85 @@
+import time
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+from .timing import measure
+
+VERSION_KEY = "resume:version"
+
+
+def get_cache():
+    return caches[settings.RESUME_CACHE_ALIAS]
+
+
+def get_version():
+    """Return the current resume content version, creating one if the cache is empty."""
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_version():
+    """Invalidate every cached payload at once by moving to a new content version."""
+    get_cache().set(VERSION_KEY, uuid4().hex, None)
+
+
+def deleted_key(model):
+    return f"resume:deleted:{model._meta.label_lower}"
+
+
+def mark_deleted(model):
+    """Record when a row of `model` was last deleted, which the newest `updated_at` of the rows left can't show."""
+    get_cache().set(deleted_key(model), time.time(), None)
+
+
+def last_deleted(models):
+    """
+    Newest deletion time of any of `models`. Deletions from before a cache
+    flush are unknown, so a missing entry starts at the time it is first read.
+    """
+    cache = get_cache()
+    keys = [deleted_key(model) for model in models]
+    found = cache.get_many(keys)
+    for key in set(keys) - set(found):
+        cache.add(key, time.time(), None)
+        found[key] = cache.get(key)
+    return max(found.values())
+
+
+def cache_key(request, version=None):
+    # The absolute URI includes the host, which ends up in serialized image URLs.
+    return f"resume:{version or get_version()}:{request.build_absolute_uri()}"
+
+
+def cached_response(request, action, *args, **kwargs):
+    """
+    Serve the serialized payload of a read action from the cache, or run the
+    action and store its payload under the current content version.
+    """
+    cache = get_cache()
+    key = cache_key(request)
+    data = cache.get(key)
+    if data is not None:
+        return Response(data)
+
+    with measure("serialize", exclude_db=True):
+        response = action(request, *args, **kwargs)
+    if response.status_code == 200:
+        cache.set(key, response.data, settings.RESUME_CACHE_TIMEOUT)
+    return response
+
+
+class CachedReadMixin:
+    """Cache the `list` and `retrieve` actions of a viewset."""
+
+    def list(self, request, *args, **kwargs):
+        return cached_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return cached_response(request, super().retrieve, *args, **kwargs)
@@ -0,0 +1,78 @@
+from hashlib import md5
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .cache import last_deleted
+
+
+def collection_state(queryset, related=()):
+    """
+    Summarize a queryset with one aggregate query: the newest `updated_at` and
+    the row count, plus the same for each nested many-to-many relation. The
+    last deletion of any of those models, read from the cache, goes in
+    `deleted_at`, since it leaves the newest `updated_at` unchanged.
+    """
+    aggregates = {"last_modified": Max("updated_at"), "count": Count("pk", distinct=True)}
+    for name in related:
+        aggregates[f"{name}_last_modified"] = Max(f"{name}__updated_at")
+        aggregates[f"{name}_count"] = Count(name)
+    state = queryset.order_by().aggregate(**aggregates)
+    model = queryset.model
+    state["deleted_at"] = last_deleted([model, *(model._meta.get_field(name).related_model for name in related)])
+    return state
+
+
+def conditional_response(request, states, action, *args, **kwargs):
+    """
+    Answer `If-None-Match` / `If-Modified-Since` with a 304 based on the given
+    collection states, otherwise run the action and tag its response.
+    """
+    renderer = getattr(request, "accepted_renderer", None)
+    # The representation also depends on the full URL (query params, host in
+    # image URLs) and on the negotiated renderer. Deletions already change the
+    # counts, so `deleted_at` is left out and a cache flush keeps ETags valid.
+    counts = [{key: value for key, value in state.items() if key != "deleted_at"} for state in states]
+    fingerprint = repr((counts, request.build_absolute_uri(), renderer and renderer.format))
+    etag = quote_etag(md5(fingerprint.encode(), usedforsecurity=False).hexdigest())
+    timestamps = [value.timestamp() for state in states for key, value in state.items() if key.endswith("last_modified") and value]
+    timestamps += [state["deleted_at"] for state in states]
+    last_modified = int(max(timestamps))
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = action(request, *args, **kwargs)
+    if response.status_code in (200, 304):
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        # Let browsers keep the body but revalidate it on every visit.
+        patch_cache_control(response, no_cache=True)
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    Add ETag / Last-Modified validators to the `list` and `retrieve` actions of
+    a viewset and short-circuit conditional requests before serialization.
+    """
+
+    # Many-to-many relations rendered inside the payload.
+    conditional_related = ()
+
+    def list(self, request, *args, **kwargs):
+        states = [collection_state(self.filter_queryset(self.get_queryset()), self.conditional_related)]
+        return conditional_response(request, states, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+            state = collection_state(queryset, self.conditional_related)
+        except (TypeError, ValueError, ValidationError):
+            # A malformed lookup value: let get_object() answer with its 404.
+            return super().retrieve(request, *args, **kwargs)
+        if not state["count"]:
+            return super().retrieve(request, *args, **kwargs)
+        return conditional_response(request, [state], super().retrieve, *args, **kwargs)
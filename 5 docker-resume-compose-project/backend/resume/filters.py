@@ -0,0 +1,53 @@
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+# Largest BigAutoField value.
+MAX_ID = 2**63 - 1
+
+
+class SkillFilterBackend(BaseFilterBackend):
+    """
+    `?skills=1,2` keeps rows linked to any of the skills, `?skills=1,2&skills_match=all`
+    rows linked to every one of them. Both compile to a single query with a
+    subquery over the skills through table, which is indexed on `skill_id`.
+    """
+
+    skills_query_param = "skills"
+    match_query_param = "skills_match"
+
+    def get_skill_ids(self, request):
+        value = request.query_params.get(self.skills_query_param)
+        if not value:
+            return None
+        try:
+            skill_ids = {int(pk) for pk in value.split(",") if pk.strip()}
+        except ValueError:
+            skill_ids = None
+        # Ids outside the primary key column's range would fail in the database instead.
+        if skill_ids is None or not all(0 < pk <= MAX_ID for pk in skill_ids):
+            raise ValidationError({self.skills_query_param: ["Expected a comma-separated list of skill ids."]})
+        return skill_ids
+
+    def filter_queryset(self, request, queryset, view):
+        skill_ids = self.get_skill_ids(request)
+        match = request.query_params.get(self.match_query_param, "any")
+        if match not in ("any", "all"):
+            raise ValidationError({self.match_query_param: ['Must be "any" or "all".']})
+        if not skill_ids:
+            return queryset
+
+        through = queryset.model.skills.through
+        owner = f"{queryset.model._meta.model_name}_id"
+        links = through.objects.filter(skill_id__in=skill_ids).order_by()
+        if match == "all":
+            # (owner, skill) is unique in the through table, so counting links counts distinct skills.
+            links = links.values(owner).annotate(matched=Count("skill_id")).filter(matched=len(skill_ids))
+        return queryset.filter(pk__in=links.values(owner))
+
+
+def usage_count(through):
+    """Correlated count of `through` rows per skill, for annotating Skill querysets."""
+    links = through.objects.filter(skill_id=OuterRef("pk")).order_by().values("skill_id").annotate(count=Count("*")).values("count")
+    return Coalesce(Subquery(links, output_field=IntegerField()), 0)
@@ -0,0 +1,124 @@
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps, features
+
+from . import snapshot
+from .cache import bump_version
+from .models import Project
+
+logger = logging.getLogger(__name__)
+
+# Pillow format name, file extension and save options per derivative format.
+FORMATS = {
+    "avif": ("AVIF", "avif", {"quality": 55}),
+    "webp": ("WEBP", "webp", {"quality": 80, "method": 6}),
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = set()
+
+
+def available_formats():
+    return [name for name in settings.RESUME_IMAGE_FORMATS if name in FORMATS and features.check(name)]
+
+
+def is_stale(project):
+    """Whether the stored derivatives don't belong to the current image."""
+    return bool(project.image) and project.image_derivatives.get("source") != project.image.name
+
+
+def build_derivatives(image_name):
+    """
+    Write resized copies of `image_name` in every available format and return
+    {"source": image_name, format: {width: path}}. File names are derived from
+    the source content hash, so re-uploading the same file reuses them.
+    """
+    with default_storage.open(image_name, "rb") as f:
+        content = f.read()
+    digest = hashlib.sha256(content).hexdigest()[:16]
+
+    with Image.open(BytesIO(content)) as original:
+        original = ImageOps.exif_transpose(original)
+        if original.mode not in ("RGB", "RGBA"):
+            original = original.convert("RGBA" if "transparency" in original.info else "RGB")
+        widths = [width for width in settings.RESUME_IMAGE_WIDTHS if width < original.width] or [original.width]
+
+        derivatives = {"source": image_name}
+        for name in available_formats():
+            pillow_format, extension, options = FORMATS[name]
+            derivatives[name] = {}
+            for width in widths:
+                path = f"{settings.RESUME_IMAGE_DERIVATIVES_DIR}/{digest}-{width}w.{extension}"
+                if not default_storage.exists(path):
+                    height = round(original.height * width / original.width)
+                    buffer = BytesIO()
+                    original.resize((width, height), Image.Resampling.LANCZOS).save(buffer, pillow_format, **options)
+                    default_storage.save(path, ContentFile(buffer.getvalue()))
+                derivatives[name][str(width)] = path
+    return derivatives
+
+
+def generate(project_id, image_name):
+    try:
+        derivatives = build_derivatives(image_name)
+        # Only store them if the image hasn't been replaced in the meantime.
+        if Project.objects.filter(pk=project_id, image=image_name).update(image_derivatives=derivatives, updated_at=timezone.now()):
+            bump_version()
+            snapshot.schedule()
+    except Exception:
+        logger.exception("Failed to build image derivatives for project %s", project_id)
+    finally:
+        _pending.discard((project_id, image_name))
+        if settings.RESUME_IMAGE_WORKERS:
+            connection.close()
+
+
+def schedule(project):
+    """
+    Queue derivative generation for the project's current image once the
+    surrounding transaction commits. It runs in a worker pool, or inline when
+    RESUME_IMAGE_WORKERS is 0.
+    """
+    image_name = project.image.name
+    transaction.on_commit(lambda: submit(project.pk, image_name))
+
+
+def submit(project_id, image_name):
+    global _executor
+    key = (project_id, image_name)
+    with _executor_lock:
+        if key in _pending:
+            return
+        _pending.add(key)
+        if settings.RESUME_IMAGE_WORKERS and _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.RESUME_IMAGE_WORKERS, thread_name_prefix="resume-images")
+    if settings.RESUME_IMAGE_WORKERS:
+        _executor.submit(generate, project_id, image_name)
+    else:
+        generate(project_id, image_name)
+
+
+def srcset(project, request=None):
+    """Map each derivative format to a `srcset` string, e.g. {"webp": "a-320w.webp 320w, ..."}."""
+    if not project.image:
+        return {}
+    if is_stale(project):
+        schedule(project)
+        return {}
+    result = {}
+    for name, widths in project.image_derivatives.items():
+        if name == "source":
+            continue
+        urls = [(default_storage.url(path), width) for width, path in widths.items()]
+        result[name] = ", ".join(f"{request.build_absolute_uri(url) if request else url} {width}w" for url, width in urls)
+    return result
@@ -0,0 +1,166 @@
+import json
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.test import Client
+
+from config import db
+from resume.cache import bump_version
+from resume.urls import router
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive every /api/ endpoint concurrently and report latency percentiles, "
+        "throughput and queries per request as JSON. Runs in-process against the "
+        "configured database unless --url points at a running server."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint.")
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--url", help="Base URL of a running server, e.g. http://localhost:8000. Query counts are only available in-process.")
+        parser.add_argument("--endpoint", action="append", dest="endpoints", help="Only benchmark this path (repeatable).")
+        parser.add_argument("--cold", action="store_true", help="Invalidate the response cache before every in-process request.")
+        parser.add_argument("--output", help="Write the JSON report to this file instead of stdout.")
+        parser.add_argument("--compare", help="Previous JSON report to compare p95 latency against.")
+        parser.add_argument("--max-regression", type=float, default=20.0, help="Fail when an endpoint's p95 grows by more than this percentage.")
+
+    def handle(self, *args, **options):
+        endpoints = options["endpoints"] or self.discover_endpoints()
+        request = self.http_request(options["url"]) if options["url"] else self.client_request(options["cold"])
+
+        started = time.perf_counter()
+        # One pool for the whole run, so persistent connections are reused across endpoints like in a server.
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+            results = {path: self.run_endpoint(executor, request, path, options["requests"]) for path in endpoints}
+        elapsed = time.perf_counter() - started
+
+        report = {
+            "config": {
+                "target": options["url"] or "in-process",
+                "database": connection.vendor,
+                "requests_per_endpoint": options["requests"],
+                "concurrency": options["concurrency"],
+                "cold_cache": options["cold"],
+            },
+            "endpoints": results,
+            "database": None if options["url"] else db.stats(),
+            "total": {
+                "requests": sum(result["requests"] for result in results.values()),
+                "errors": sum(result["errors"] for result in results.values()),
+                "seconds": round(elapsed, 3),
+            },
+        }
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+        if options["compare"]:
+            self.compare(report, options["compare"], options["max_regression"])
+
+    def discover_endpoints(self):
+        endpoints = ["/api/resume/"]
+        for prefix, viewset, basename in router.registry:
+            endpoints.append(f"/api/{prefix}/")
+            pk = viewset.queryset.values_list("pk", flat=True).first()
+            if pk is not None:
+                endpoints.append(f"/api/{prefix}/{pk}/")
+        return endpoints
+
+    def client_request(self, cold):
+        host = next((host for host in settings.ALLOWED_HOSTS if host and "*" not in host and not host.startswith(".")), "localhost")
+
+        def request(path):
+            if cold:
+                bump_version()
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                response = Client(SERVER_NAME=host).get(path)
+            return response.status_code, counter.count
+
+        return request
+
+    def http_request(self, base_url):
+        def request(path):
+            try:
+                with urlopen(base_url.rstrip("/") + path) as response:
+                    response.read()
+                    return response.status, None
+            except HTTPError as e:
+                return e.code, None
+
+        return request
+
+    def run_endpoint(self, executor, request, path, total):
+        def timed(_):
+            started = time.perf_counter()
+            try:
+                status, queries = request(path)
+            finally:
+                # What Django does at the end of a request: honour CONN_MAX_AGE or return pooled connections.
+                close_old_connections()
+            return time.perf_counter() - started, status, queries
+
+        started = time.perf_counter()
+        samples = list(executor.map(timed, range(total)))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(sample[0] * 1000 for sample in samples)
+        queries = [sample[2] for sample in samples if sample[2] is not None]
+        return {
+            "requests": total,
+            "errors": sum(1 for sample in samples if sample[1] >= 400),
+            "throughput_rps": round(total / elapsed, 2),
+            "mean_ms": round(statistics.fmean(latencies), 3),
+            "p50_ms": round(self.percentile(latencies, 50), 3),
+            "p95_ms": round(self.percentile(latencies, 95), 3),
+            "p99_ms": round(self.percentile(latencies, 99), 3),
+            "queries_per_request": round(statistics.fmean(queries), 2) if queries else None,
+        }
+
+    @staticmethod
+    def percentile(sorted_values, percent):
+        """Nearest-rank percentile of an already sorted list."""
+        index = max(0, min(len(sorted_values) - 1, round(percent / 100 * len(sorted_values) + 0.5) - 1))
+        return sorted_values[index]
+
+    def compare(self, report, baseline_path, max_regression):
+        try:
+            with open(baseline_path) as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Can't read baseline report: {e}")
+
+        regressions = []
+        for path, result in report["endpoints"].items():
+            previous = baseline.get("endpoints", {}).get(path)
+            if not previous or not previous["p95_ms"]:
+                continue
+            change = (result["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] * 100
+            self.stderr.write(f"{path}: p95 {previous['p95_ms']}ms -> {result['p95_ms']}ms ({change:+.1f}%), queries {previous['queries_per_request']} -> {result['queries_per_request']}")
+            if change > max_regression or (result["queries_per_request"] or 0) > (previous["queries_per_request"] or sys.maxsize):
+                regressions.append(path)
+
+        if regressions:
+            raise CommandError(f"Regressions in: {', '.join(regressions)}")
@@ -0,0 +1,76 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.client import RequestFactory
+from rest_framework.renderers import JSONRenderer
+
+from resume.models import Skill, Project, Experience, Education, Certification
+from resume.serializers import SkillSerializer, ProjectSerializer, ExperienceSerializer, EducationSerializer, CertificationSerializer, ValuesSerializer
+from resume.views import skills_prefetch
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Serialize and render N rows of every resume model through the ModelSerializers and through ValuesSerializer, "
+        "check the JSON is byte-identical and report the timings. Rows are created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--skills-per-row", type=int, default=5)
+        parser.add_argument("--repeat", type=int, default=3, help="Best of this many runs.")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.seed(options["rows"], options["skills_per_row"])
+                self.compare(options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, rows, per_row):
+        skills = Skill.objects.bulk_create([Skill(name=f"Skill {i}", description="d") for i in range(max(per_row, 50))])
+        for model, build in [
+            (Project, lambda i: Project(title=f"Project {i}", description="Lorem ipsum " * 10, github_link=f"https://github.com/example/{i}")),
+            (Experience, lambda i: Experience(company=f"Company {i}", position="Engineer", description="Lorem ipsum " * 10, start_date=date(2020, 1, 1 + i % 28))),
+        ]:
+            objects = model.objects.bulk_create([build(i) for i in range(rows)], batch_size=1000)
+            links = [model.skills.through(**{f"{model._meta.model_name}_id": obj.pk, "skill_id": skills[(obj.pk + j) % len(skills)].pk}) for obj in objects for j in range(per_row)]
+            model.skills.through.objects.bulk_create(links, batch_size=5000)
+        Education.objects.bulk_create([Education(institution=f"University {i}", degree="BSc", start_date=date(2015, 1, 1), gpa="3.50") for i in range(rows)], batch_size=1000)
+        Certification.objects.bulk_create([Certification(name=f"Cert {i}", issuing_organization="Org", issue_date=date(2021, 1, 1)) for i in range(rows)], batch_size=1000)
+
+    def compare(self, repeat):
+        context = {"request": RequestFactory().get("/")}
+        renderer = JSONRenderer()
+        self.stdout.write(f"{'serializer':<28} {'rows':>7} {'model ms':>10} {'values ms':>10} {'speedup':>8}")
+        for serializer_class, queryset in [
+            (SkillSerializer, Skill.objects.all()),
+            (ProjectSerializer, Project.objects.prefetch_related(skills_prefetch())),
+            (ExperienceSerializer, Experience.objects.prefetch_related(skills_prefetch())),
+            (EducationSerializer, Education.objects.all()),
+            (CertificationSerializer, Certification.objects.all()),
+        ]:
+            model_time, model_json = self.best(repeat, lambda: renderer.render(serializer_class(queryset.all(), many=True, context=context).data))
+            values_time, values_json = self.best(repeat, lambda: renderer.render(ValuesSerializer(serializer_class, context=context).many(queryset.all())))
+            if model_json != values_json:
+                raise CommandError(f"{serializer_class.__name__}: ValuesSerializer output differs")
+            self.stdout.write(
+                f"{serializer_class.__name__:<28} {queryset.count():>7} {model_time * 1000:>10.1f} {values_time * 1000:>10.1f} {model_time / values_time:>7.1f}x"
+            )
+
+    @staticmethod
+    def best(repeat, render):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            output = render()
+            timings.append(time.perf_counter() - started)
+        return min(timings), output
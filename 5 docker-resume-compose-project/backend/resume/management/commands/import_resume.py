@@ -0,0 +1,60 @@
+import os
+import time
+from collections import Counter
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, transaction
+
+from resume import bulk_import, search, snapshot
+from resume.cache import bump_version
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-load resume data from a dumpdata fixture (.json) or JSON Lines file (.jsonl) in batched transactions. "
+        "Much faster than loaddata for large datasets; uses COPY on PostgreSQL. "
+        "Skills must come before the projects and experiences that link to them, as dumpdata writes them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Records per transaction.")
+        parser.add_argument("--resume", action="store_true", help="Continue after the last batch committed by a failed run.")
+        parser.add_argument("--checkpoint", help="Progress file. Defaults to PATH.progress.")
+        parser.add_argument("--no-copy", action="store_true", help="Use batched INSERTs instead of COPY on PostgreSQL.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        checkpoint = options["checkpoint"] or f"{path}.progress"
+        start = bulk_import.read_checkpoint(checkpoint) if options["resume"] else 0
+        if start:
+            self.stdout.write(f"Resuming after record {start}")
+
+        totals = Counter()
+        started = time.perf_counter()
+        try:
+            with open(path, encoding="utf-8") as stream:
+                batches = bulk_import.run(stream, path, options["batch_size"], checkpoint, start, False if options["no_copy"] else None)
+                for position, counts in batches:
+                    totals.update(counts)
+                    if options["verbosity"] > 1:
+                        elapsed = time.perf_counter() - started
+                        self.stdout.write(f"{position} records, {sum(totals.values()) / elapsed:,.0f} rows/s")
+        except (OSError, ValueError, KeyError, ValidationError, DatabaseError) as e:
+            # Caches and the index are left for the --resume run to refresh once everything is in.
+            raise CommandError(f"Import stopped ({e!r}); rerun with --resume to continue from {checkpoint}") from e
+        elapsed = time.perf_counter() - started
+
+        # Bulk inserts send no signals, so invalidate cached responses and rebuild the search index ourselves.
+        if totals:
+            transaction.on_commit(bump_version)
+            snapshot.schedule()
+            self.stdout.write(f"Indexed {search.rebuild()} search documents")
+
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        for label, count in sorted(totals.items()):
+            self.stdout.write(f"{label:<28} {count:>10}")
+        rows = sum(totals.values())
+        self.stdout.write(self.style.SUCCESS(f"Imported {rows} rows in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:,.0f} rows/s)"))
@@ -0,0 +1,30 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from resume import snapshot
+
+
+class Command(BaseCommand):
+    help = "Render every resume API list and detail response into precompressed files served by SnapshotMiddleware."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dir", default=settings.RESUME_SNAPSHOT_DIR, help="Snapshot root, RESUME_SNAPSHOT_DIR by default.")
+        parser.add_argument("--base-url", default=settings.RESUME_SNAPSHOT_BASE_URL, help="Scheme and host to render absolute URLs for.")
+        parser.add_argument("--withdraw", action="store_true", help="Stop serving the current snapshot instead.")
+
+    def handle(self, *args, **options):
+        if options["withdraw"]:
+            snapshot.withdraw(options["dir"])
+            self.stdout.write(self.style.SUCCESS("Snapshot withdrawn; requests go to the live API"))
+            return
+
+        started = time.perf_counter()
+        directory = snapshot.publish(options["dir"], options["base_url"])
+        if directory is None:
+            raise CommandError("Data changed or another snapshot was published while rendering; not activated")
+        size = sum(os.path.getsize(os.path.join(path, name)) for path, _, names in os.walk(directory) for name in names)
+        manifest = snapshot.current(options["dir"])[1]
+        self.stdout.write(self.style.SUCCESS(f"Published {manifest['urls']} URLs ({size / 1024:.0f} KiB with compressed variants) to {directory} in {time.perf_counter() - started:.2f}s"))
@@ -0,0 +1,17 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from resume import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index from every resume model, e.g. after bulk loads that skip signals."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = search.rebuild(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} search documents in {time.perf_counter() - started:.2f}s"))
@@ -0,0 +1,62 @@
+import random
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from resume import search, snapshot
+from resume.cache import bump_version
+from resume.models import Skill, Project, Experience, Education, Certification
+
+
+class Command(BaseCommand):
+    help = "Seed a scaled synthetic resume dataset for benchmarking."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--projects", type=int, default=100)
+        parser.add_argument("--experiences", type=int, default=100)
+        parser.add_argument("--education", type=int, default=10)
+        parser.add_argument("--certifications", type=int, default=10)
+        parser.add_argument("--skills", type=int, default=50)
+        parser.add_argument("--skills-per-row", type=int, default=5)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=0, help="Random seed, so runs are comparable.")
+        parser.add_argument("--clear", action="store_true", help="Delete existing resume data first.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        batch_size = options["batch_size"]
+        per_row = min(options["skills_per_row"], options["skills"])
+
+        with transaction.atomic():
+            if options["clear"]:
+                for model in [Project, Experience, Education, Certification, Skill]:
+                    model.objects.all().delete()
+
+            skills = Skill.objects.bulk_create([Skill(name=f"Skill {i}", description=f"Description of skill {i}") for i in range(options["skills"])], batch_size=batch_size)
+            skill_ids = [skill.pk for skill in skills]
+
+            for model, count, build in [
+                (Project, options["projects"], lambda i: Project(title=f"Project {i}", description="Lorem ipsum dolor sit amet. " * 20, production_link=f"https://example.com/{i}", github_link=f"https://github.com/example/{i}")),
+                (Experience, options["experiences"], lambda i: Experience(company=f"Company {i}", position="Software Engineer", description="Lorem ipsum dolor sit amet. " * 20, start_date=self.random_date(rng), location="Remote", is_current=i == 0)),
+            ]:
+                for start in range(0, count, batch_size):
+                    objects = model.objects.bulk_create([build(i) for i in range(start, min(start + batch_size, count))])
+                    if skill_ids:
+                        links = [model.skills.through(**{f"{model._meta.model_name}_id": obj.pk, "skill_id": skill_id}) for obj in objects for skill_id in rng.sample(skill_ids, per_row)]
+                        model.skills.through.objects.bulk_create(links, batch_size=batch_size)
+                self.stdout.write(f"Created {count} {model._meta.verbose_name_plural}")
+
+            Education.objects.bulk_create([Education(institution=f"University {i}", degree="BSc", field_of_study="Computer Science", start_date=self.random_date(rng), gpa="3.50") for i in range(options["education"])], batch_size=batch_size)
+            Certification.objects.bulk_create([Certification(name=f"Certification {i}", issuing_organization="Org", issue_date=self.random_date(rng), credential_id=f"ID-{i}") for i in range(options["certifications"])], batch_size=batch_size)
+
+            # bulk_create sends no signals, so invalidate cached responses and rebuild the search index ourselves.
+            transaction.on_commit(bump_version)
+            snapshot.schedule()
+            self.stdout.write(f"Indexed {search.rebuild(batch_size)} search documents")
+
+        self.stdout.write(self.style.SUCCESS("Seeding finished"))
+
+    @staticmethod
+    def random_date(rng):
+        return date(2000, 1, 1) + timedelta(days=rng.randrange(9000))
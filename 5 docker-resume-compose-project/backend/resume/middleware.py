@@ -0,0 +1,101 @@
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.http import Http404
+
+from config.static import serve
+
+from . import snapshot
+from .timing import RequestTimings, activate, deactivate, histograms
+
+logger = logging.getLogger("resume.timing")
+
+
+class ServerTimingMiddleware:
+    """
+    Record query count, DB time, DRF auth and serialization time and total time
+    for every request. They are sent as a `Server-Timing` header, logged as a
+    JSON line and added to per-route rolling histograms.
+
+    Place it first in MIDDLEWARE so "total" includes the rest of the stack.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        token = activate(timings)
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(timings):
+                response = self.get_response(request)
+        finally:
+            deactivate(token)
+        total = (time.perf_counter() - started) * 1000
+
+        spans = {name: seconds * 1000 for name, seconds in timings.spans.items()}
+        metrics = [f'db;dur={timings.db * 1000:.2f};desc="{timings.queries} queries"']
+        metrics += [f"{name};dur={milliseconds:.2f}" for name, milliseconds in spans.items()]
+        metrics.append(f"total;dur={total:.2f}")
+        response["Server-Timing"] = ", ".join(metrics)
+
+        match = request.resolver_match
+        route = f"{request.method} {match.route}" if match else f"{request.method} <unresolved>"
+        histograms.observe(route, total)
+        logger.info(
+            json.dumps(
+                {
+                    "event": "request_timing",
+                    "method": request.method,
+                    "path": request.path,
+                    "route": match.route if match else None,
+                    "status": response.status_code,
+                    "queries": timings.queries,
+                    "db_ms": round(timings.db * 1000, 3),
+                    **{f"{name}_ms": round(milliseconds, 3) for name, milliseconds in spans.items()},
+                    "total_ms": round(total, 3),
+                }
+            )
+        )
+        return response
+
+
+class SnapshotMiddleware:
+    """
+    Answer plain GETs of published resume API URLs straight from the snapshot
+    files (see resume/snapshot.py) with precompressed, sendfile-friendly
+    responses. Anything else, including a URL missing from the snapshot, goes
+    on to the live views.
+
+    Place it right after CorsMiddleware so snapshot responses still get CORS headers.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.from_snapshot(request)
+        if response is None:
+            response = self.get_response(request)
+        return response
+
+    def from_snapshot(self, request):
+        # Query parameters (fields, filters, pagination) and the browsable API are rendered live.
+        if request.method not in ("GET", "HEAD") or request.META.get("QUERY_STRING") or "text/html" in request.META.get("HTTP_ACCEPT", ""):
+            return None
+        active = snapshot.current(settings.RESUME_SNAPSHOT_DIR)
+        if active is None:
+            return None
+        directory, manifest = active
+        if not request.path.startswith(manifest["prefix"]) or request.get_host() != manifest["host"]:
+            return None
+        try:
+            response = serve(request, request.path.lstrip("/") + snapshot.INDEX, directory, max_age=0)
+        except Http404:
+            return None
+        response["X-Resume-Snapshot"] = directory.rsplit("/", 1)[-1]
+        return response
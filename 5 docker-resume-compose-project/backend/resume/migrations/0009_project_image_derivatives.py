@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 23:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume', '0008_auto_20251007_2228'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='image_derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
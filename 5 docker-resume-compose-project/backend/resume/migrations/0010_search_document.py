@@ -0,0 +1,94 @@
+# Generated by Django 5.2.6 on 2026-10-18 00:24
+
+from django.db import migrations, models
+
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "ALTER TABLE resume_searchdocument ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', body), 'B')) STORED",
+    "CREATE INDEX resume_search_vector ON resume_searchdocument USING gin (search_vector)",
+    "CREATE INDEX resume_search_title_trgm ON resume_searchdocument USING gin (title gin_trgm_ops)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS resume_search_title_trgm",
+    "DROP INDEX IF EXISTS resume_search_vector",
+    "ALTER TABLE resume_searchdocument DROP COLUMN IF EXISTS search_vector",
+]
+# External-content FTS5 table kept in sync with resume_searchdocument by triggers.
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE resume_searchdocument_fts USING fts5("
+    "title, body, content='resume_searchdocument', content_rowid='id', tokenize='unicode61')",
+    "CREATE TRIGGER resume_searchdocument_ai AFTER INSERT ON resume_searchdocument BEGIN "
+    "INSERT INTO resume_searchdocument_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER resume_searchdocument_ad AFTER DELETE ON resume_searchdocument BEGIN "
+    "INSERT INTO resume_searchdocument_fts(resume_searchdocument_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER resume_searchdocument_au AFTER UPDATE ON resume_searchdocument BEGIN "
+    "INSERT INTO resume_searchdocument_fts(resume_searchdocument_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO resume_searchdocument_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS resume_searchdocument_au",
+    "DROP TRIGGER IF EXISTS resume_searchdocument_ad",
+    "DROP TRIGGER IF EXISTS resume_searchdocument_ai",
+    "DROP TABLE IF EXISTS resume_searchdocument_fts",
+]
+STATEMENTS = {"postgresql": (POSTGRES_FORWARD, POSTGRES_BACKWARD), "sqlite": (SQLITE_FORWARD, SQLITE_BACKWARD)}
+
+# Frozen copy of resume.search.INDEXED_FIELDS: (title fields, body fields).
+INDEXED_FIELDS = {
+    "skill": (["name"], ["description"]),
+    "project": (["title"], ["description", "production_link", "github_link"]),
+    "experience": (["position", "company"], ["description", "location"]),
+    "education": (["degree", "institution"], ["field_of_study", "description", "location"]),
+    "certification": (["name", "issuing_organization"], ["description", "credential_id"]),
+}
+
+
+def create_index(apps, schema_editor):
+    for sql in STATEMENTS.get(schema_editor.connection.vendor, ([], []))[0]:
+        schema_editor.execute(sql)
+
+
+def drop_index(apps, schema_editor):
+    for sql in STATEMENTS.get(schema_editor.connection.vendor, ([], []))[1]:
+        schema_editor.execute(sql)
+
+
+def populate(apps, schema_editor):
+    SearchDocument = apps.get_model("resume", "SearchDocument")
+    documents = []
+    for model_name, (title_fields, body_fields) in INDEXED_FIELDS.items():
+        for values in apps.get_model("resume", model_name).objects.values("pk", *title_fields, *body_fields):
+            documents.append(SearchDocument(
+                model=model_name,
+                object_id=values["pk"],
+                title=" ".join(str(values[name]) for name in title_fields if values[name]),
+                body=" ".join(str(values[name]) for name in body_fields if values[name]),
+            ))
+    SearchDocument.objects.bulk_create(documents, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume', '0009_project_image_derivatives'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.TextField()),
+                ('body', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('model', 'object_id'), name='unique_search_document')],
+            },
+        ),
+        migrations.RunPython(create_index, drop_index),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
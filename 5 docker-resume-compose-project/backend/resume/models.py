@@ -17,6 +17,8 @@ class Project(models.Model):
     production_link = models.URLField(blank=True, null=True)
     github_link = models.URLField(blank=True, null=True)
     image = models.ImageField(upload_to="projects/", blank=True, null=True)
+    # Resized WebP/AVIF copies of `image`, filled in by resume/images.py
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False)
     skills = models.ManyToManyField(Skill, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
@@ -82,3 +84,26 @@ class Certification(models.Model):
 
     def __str__(self):
         return f"{self.name} by {self.issuing_organization}"
+
+
+class SearchDocument(models.Model):
+    """
+    Searchable text of one resume object, kept up to date on save. The full-text
+    index over it is database specific and created in migration 0010: a
+    tsvector column with GIN and trigram indexes on PostgreSQL, an FTS5 table
+    on SQLite (see resume/search.py).
+    """
+
+    model = models.CharField(max_length=20)
+    object_id = models.PositiveBigIntegerField()
+    title = models.TextField()
+    body = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["model", "object_id"], name="unique_search_document"),
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id}: {self.title}"
@@ -0,0 +1,23 @@
+from rest_framework.pagination import CursorPagination
+
+
+def get_ordering(model):
+    """
+    Cursor ordering for a resume model: its `Meta.ordering` (or creation time
+    when it has none), with the primary key as a tie-breaker.
+    """
+    return tuple(model._meta.ordering or ["-created_at"]) + ("-pk",)
+
+
+class ResumeCursorPagination(CursorPagination):
+    """
+    Opt-in cursor pagination. Without `?page_size=` list endpoints keep
+    returning plain arrays, so existing clients are unaffected.
+    """
+
+    page_size = None
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        return get_ordering(queryset.model)
@@ -0,0 +1,129 @@
+import re
+
+from django.db import connection, transaction
+
+from .models import Skill, Project, Experience, Education, Certification, SearchDocument
+
+# Per model: fields joined into the document title (weighted higher) and body.
+INDEXED_FIELDS = {
+    Skill: (["name"], ["description"]),
+    Project: (["title"], ["description", "production_link", "github_link"]),
+    Experience: (["position", "company"], ["description", "location"]),
+    Education: (["degree", "institution"], ["field_of_study", "description", "location"]),
+    Certification: (["name", "issuing_organization"], ["description", "credential_id"]),
+}
+MODELS = {model._meta.model_name: model for model in INDEXED_FIELDS}
+TOKEN = re.compile(r"\w+")
+
+
+def join(values):
+    return " ".join(str(value) for value in values if value)
+
+
+def document_text(model, values):
+    """(title, body) for one object, from a dict of its indexed field values."""
+    title_fields, body_fields = INDEXED_FIELDS[model]
+    return join(values[name] for name in title_fields), join(values[name] for name in body_fields)
+
+
+def index(instance):
+    model = type(instance)
+    names = [name for fields in INDEXED_FIELDS[model] for name in fields]
+    deferred = instance.get_deferred_fields().intersection(names)
+    if deferred:
+        # Loaded with .only() or .defer(): fetch the skipped columns in one query rather than one per field.
+        instance.refresh_from_db(fields=sorted(deferred))
+    title, body = document_text(model, {name: getattr(instance, name) for name in names})
+    SearchDocument.objects.update_or_create(model=model._meta.model_name, object_id=instance.pk, defaults={"title": title, "body": body})
+
+
+def unindex(instance):
+    SearchDocument.objects.filter(model=type(instance)._meta.model_name, object_id=instance.pk).delete()
+
+
+def rebuild(batch_size=1000):
+    """Rebuild every search document, e.g. after bulk_create, which sends no signals. Returns the number indexed."""
+    count = 0
+    with transaction.atomic():
+        SearchDocument.objects.all().delete()
+        for model, (title_fields, body_fields) in INDEXED_FIELDS.items():
+            batch = []
+            for values in model.objects.order_by().values("pk", *title_fields, *body_fields).iterator(chunk_size=batch_size):
+                title, body = document_text(model, values)
+                batch.append(SearchDocument(model=model._meta.model_name, object_id=values["pk"], title=title, body=body))
+                if len(batch) >= batch_size:
+                    count += len(SearchDocument.objects.bulk_create(batch))
+                    batch = []
+            count += len(SearchDocument.objects.bulk_create(batch))
+    return count
+
+
+def postgres_search(tokens, model_names, limit):
+    # Prefix matches on the tsvector, plus trigram similarity on the title for typos.
+    sql = (
+        "SELECT d.id, ts_rank_cd(d.search_vector, q) + similarity(d.title, %s) AS rank"
+        " FROM resume_searchdocument d, to_tsquery('simple', %s) q"
+        " WHERE (d.search_vector @@ q OR d.title %% %s)"
+    )
+    text = " ".join(tokens)
+    params = [text, " & ".join(f"{token}:*" for token in tokens), text]
+    if model_names:
+        sql += " AND d.model = ANY(%s)"
+        params.append(list(model_names))
+    sql += " ORDER BY rank DESC, d.id"
+    if limit:
+        sql += " LIMIT %s"
+        params.append(limit)
+    return sql, params
+
+
+def sqlite_search(tokens, model_names, limit):
+    # bm25() is lower-is-better; the title column weighs ten times the body.
+    sql = (
+        "SELECT d.id, -bm25(resume_searchdocument_fts, 10.0, 1.0) AS rank"
+        " FROM resume_searchdocument_fts JOIN resume_searchdocument d ON d.id = resume_searchdocument_fts.rowid"
+        " WHERE resume_searchdocument_fts MATCH %s"
+    )
+    params = [" ".join(f'"{token}"*' for token in tokens)]
+    if model_names:
+        sql += f" AND d.model IN ({', '.join(['%s'] * len(model_names))})"
+        params.extend(model_names)
+    sql += " ORDER BY rank DESC, d.id"
+    if limit:
+        sql += " LIMIT %s"
+        params.append(limit)
+    return sql, params
+
+
+BACKENDS = {"postgresql": postgres_search, "sqlite": sqlite_search}
+
+
+def search(query, model_names=None, limit=20):
+    """Ranked SearchDocuments matching every word of `query` (as a prefix), each with a `rank` attribute."""
+    tokens = TOKEN.findall(query.lower())
+    if not tokens:
+        return []
+    if connection.vendor not in BACKENDS:
+        # No full-text index on this database: unranked substring matches.
+        documents = SearchDocument.objects.filter(title__icontains=query) | SearchDocument.objects.filter(body__icontains=query)
+        if model_names:
+            documents = documents.filter(model__in=model_names)
+        documents = list(documents.order_by("id")[:limit])
+        for document in documents:
+            document.rank = 0
+        return documents
+
+    sql, params = BACKENDS[connection.vendor](tokens, model_names, limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        ranks = dict(cursor.fetchall())
+    documents = SearchDocument.objects.in_bulk(list(ranks))
+    for pk, document in documents.items():
+        document.rank = ranks[pk]
+    return sorted(documents.values(), key=lambda document: (-document.rank, document.pk))
+
+
+def object_ids(model, query):
+    """Primary keys of `model` objects matching `query`, for admin changelist search."""
+    return [document.object_id for document in search(query, [model._meta.model_name], limit=None)]
+
@@ -1,22 +1,53 @@
+from collections import defaultdict
+
+from django.core.files.storage import default_storage
 from rest_framework import serializers
+
+from . import images
 from .models import Skill, Project, Experience, Education, Certification
 
 
-class SkillSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """
+    Accept a `fields` keyword argument that restricts the serializer to a
+    subset of its declared fields.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SkillSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Skill
         fields = ["id", "name"]
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     skills = SkillSerializer(many=True)
+    image_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Project
-        fields = ["id", "title", "description", "production_link", "github_link", "image", "skills"]
+        fields = ["id", "title", "description", "production_link", "github_link", "image", "image_srcset", "skills"]
+        # Columns loaded for fields that aren't model columns, by sparse fieldsets and ValuesSerializer.
+        field_dependencies = {"image_srcset": ["image", "image_derivatives"]}
 
+    def get_image_srcset(self, obj):
+        return images.srcset(obj, self.context.get("request"))
 
-class ExperienceSerializer(serializers.ModelSerializer):
+    def image_srcset_from_values(self, row):
+        if not row["image"]:
+            return {}
+        project = Project(pk=row["id"], image=row["image"], image_derivatives=row["image_derivatives"])
+        return images.srcset(project, self.context.get("request"))
+
+
+class ExperienceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     skills = SkillSerializer(many=True)
 
     class Meta:
@@ -24,13 +55,85 @@ class ExperienceSerializer(serializers.ModelSerializer):
         fields = ["id", "company", "position", "description", "start_date", "end_date", "location", "company_website", "skills", "is_current"]
 
 
-class EducationSerializer(serializers.ModelSerializer):
+class EducationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Education
         fields = ["id", "institution", "degree", "field_of_study", "start_date", "end_date", "gpa", "description", "location"]
 
 
-class CertificationSerializer(serializers.ModelSerializer):
+class CertificationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Certification
         fields = ["id", "name", "issuing_organization", "issue_date", "credential_id", "credential_url", "description"]
+
+
+class ValuesSerializer:
+    """
+    Read-only fast path for one of the serializers above. Rows come from
+    `.values()` and nested skills from one grouped query, and only fields whose
+    column value differs from its JSON form (dates, decimals, files) go through
+    their DRF field, so no field objects run per row. The output is identical
+    to the ModelSerializer's.
+    """
+
+    def __init__(self, serializer_class, fields=None, context=None):
+        self.serializer = serializer_class(fields=fields, context=context or {})
+        self.model = serializer_class.Meta.model
+        concrete = {field.name for field in self.model._meta.concrete_fields}
+        dependencies = getattr(serializer_class.Meta, "field_dependencies", {})
+
+        self.fields = []
+        columns = {"id"}
+        for name, field in self.serializer.fields.items():
+            if name in concrete:
+                columns.add(name)
+                self.fields.append((name, name, self.converter(field)))
+            elif name == "skills":
+                self.fields.append((name, None, None))
+            else:
+                columns.update(dependencies.get(name, []))
+                self.fields.append((name, None, getattr(self.serializer, f"{name}_from_values")))
+        self.columns = sorted(columns)
+
+    def converter(self, field):
+        if isinstance(field, serializers.FileField):
+            return self.file_url
+        if isinstance(field, (serializers.DateField, serializers.DateTimeField, serializers.DecimalField)):
+            return field.to_representation
+        return None
+
+    def file_url(self, name):
+        # serializers.FileField with use_url: an absolute URL when there's a request, None for an empty file.
+        if not name:
+            return None
+        url = default_storage.url(name)
+        request = self.serializer.context.get("request")
+        return request.build_absolute_uri(url) if request is not None else url
+
+    def skills(self, ids):
+        """{row id: [{"id", "name"}, ...]}, ordered by skill id like the viewsets' skills prefetch."""
+        owner = self.model._meta.model_name
+        grouped = defaultdict(list)
+        for owner_id, skill_id, name in Skill.objects.filter(**{f"{owner}__in": ids}).order_by("id").values_list(owner, "id", "name"):
+            grouped[owner_id].append({"id": skill_id, "name": name})
+        return grouped
+
+    def to_representation(self, rows):
+        skills = self.skills([row["id"] for row in rows]) if any(name == "skills" for name, _, _ in self.fields) else {}
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, convert in self.fields:
+                if column is None:
+                    item[name] = skills.get(row["id"], []) if name == "skills" else convert(row)
+                else:
+                    value = row[column]
+                    item[name] = value if value is None or convert is None else convert(value)
+            data.append(item)
+        return data
+
+    def rows(self, queryset):
+        return queryset.prefetch_related(None).values(*self.columns)
+
+    def many(self, queryset):
+        return self.to_representation(list(self.rows(queryset)))
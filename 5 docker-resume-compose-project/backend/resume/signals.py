@@ -0,0 +1,52 @@
+from django.db import transaction
+from django.utils import timezone
+from django.db.models.signals import post_save, post_delete, m2m_changed
+
+from . import images, search, snapshot
+from .cache import bump_version, mark_deleted
+from .models import Skill, Project, Experience, Education, Certification
+
+RESUME_MODELS = [Skill, Project, Experience, Education, Certification]
+
+
+def invalidate_resume_cache(**kwargs):
+    # Bump after commit so a concurrent reader can't cache pre-commit data under the new version.
+    transaction.on_commit(bump_version)
+    snapshot.schedule()
+
+
+def record_deletion(sender, **kwargs):
+    transaction.on_commit(lambda: mark_deleted(sender))
+
+
+def touch_m2m_owner(instance, action, **kwargs):
+    # Relation changes don't save the instance, so bump its `updated_at` for ETag / Last-Modified validators.
+    if action in ("post_add", "post_remove", "post_clear"):
+        type(instance).objects.filter(pk=instance.pk).update(updated_at=timezone.now())
+
+
+def index_search_document(instance, **kwargs):
+    search.index(instance)
+
+
+def unindex_search_document(instance, **kwargs):
+    search.unindex(instance)
+
+
+def schedule_image_derivatives(instance, **kwargs):
+    if images.is_stale(instance):
+        images.schedule(instance)
+
+
+for model in RESUME_MODELS:
+    post_save.connect(invalidate_resume_cache, sender=model, dispatch_uid=f"resume_cache_save_{model.__name__}")
+    post_delete.connect(invalidate_resume_cache, sender=model, dispatch_uid=f"resume_cache_delete_{model.__name__}")
+    post_delete.connect(record_deletion, sender=model, dispatch_uid=f"resume_deletion_{model.__name__}")
+    post_save.connect(index_search_document, sender=model, dispatch_uid=f"resume_search_save_{model.__name__}")
+    post_delete.connect(unindex_search_document, sender=model, dispatch_uid=f"resume_search_delete_{model.__name__}")
+
+for through in [Project.skills.through, Experience.skills.through]:
+    m2m_changed.connect(invalidate_resume_cache, sender=through, dispatch_uid=f"resume_cache_m2m_{through.__name__}")
+    m2m_changed.connect(touch_m2m_owner, sender=through, dispatch_uid=f"resume_touch_m2m_{through.__name__}")
+
+post_save.connect(schedule_image_derivatives, sender=Project, dispatch_uid="resume_project_image_derivatives")
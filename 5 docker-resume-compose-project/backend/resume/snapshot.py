@@ -0,0 +1,211 @@
+import fcntl
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.test.client import RequestFactory
+from django.urls import resolve, reverse
+
+from config.storage import compress_file
+
+logger = logging.getLogger(__name__)
+
+CURRENT = "current"
+MANIFEST = "manifest.json"
+INDEX = "index.json"
+# Dot-prefixed, so pruning never touches them: builds in progress, the lock and the time of the last withdraw().
+BUILDING = ".build-"
+LOCK = ".lock"
+WITHDRAWN = ".withdrawn"
+
+_lock = threading.Lock()
+_dirty = False
+_running = False
+_loaded = (None, None)
+
+
+def urls():
+    """Every list and detail URL of the resume router, plus the combined /resume/ endpoint."""
+    from .urls import router
+
+    yield reverse("resume")
+    for prefix, viewset, basename in router.registry:
+        yield reverse(f"{basename}-list")
+        for pk in viewset.queryset.model.objects.order_by("pk").values_list("pk", flat=True):
+            yield reverse(f"{basename}-detail", args=[pk])
+
+
+def render(factory, url, host, secure):
+    """The rendered body of a GET to `url` through the live view, or None when it isn't a 200."""
+    match = resolve(url)
+    request = factory.get(url, HTTP_HOST=host, HTTP_ACCEPT="application/json", secure=secure)
+    response = match.func(request, *match.args, **match.kwargs)
+    if response.status_code != 200:
+        return None
+    return response.render().content
+
+
+@contextmanager
+def locked(root):
+    """Hold an exclusive lock on ROOT, shared by every process that publishes into it."""
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, LOCK), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+def withdrawn_at(root):
+    try:
+        with open(os.path.join(root, WITHDRAWN)) as f:
+            return float(f.read())
+    except (OSError, ValueError):
+        return 0
+
+
+def build(root=None, base_url=None):
+    """
+    Render every URL into ROOT/.build-<stamp>/<url>/index.json with gzip and
+    brotli variants next to it and return the new directory. It isn't served
+    until activate() moves it to ROOT/<stamp> and points ROOT/current at it.
+    """
+    root = str(root or settings.RESUME_SNAPSHOT_DIR)
+    parts = urlsplit(base_url or settings.RESUME_SNAPSHOT_BASE_URL)
+    directory = os.path.join(root, f"{BUILDING}{time.strftime('%Y%m%d%H%M%S')}-{uuid4().hex[:8]}")
+    started = time.time()
+    factory = RequestFactory()
+
+    published = []
+    for url in urls():
+        content = render(factory, url, parts.netloc, parts.scheme == "https")
+        if content is None:
+            continue
+        path = os.path.join(directory, url.lstrip("/"), INDEX)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+        compress_file(path)
+        published.append(url)
+
+    manifest = {"host": parts.netloc, "prefix": os.path.commonpath(published) if published else "/", "urls": len(published), "started_at": started, "published_at": time.time()}
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, MANIFEST), "w") as f:
+        json.dump(manifest, f)
+    return directory
+
+
+def activate(directory, keep=1):
+    """
+    Move a build() into place, atomically point ROOT/current at it and delete all
+    but `keep` older snapshots. Returns the served directory, or None when the
+    build started before the active snapshot or the last withdraw(), possibly in
+    another process, in which case it is discarded.
+    """
+    root = os.path.dirname(directory)
+    with open(os.path.join(directory, MANIFEST)) as f:
+        started = json.load(f)["started_at"]
+    with locked(root):
+        active = current(root)
+        if started < max(active[1].get("started_at", 0) if active else 0, withdrawn_at(root)):
+            shutil.rmtree(directory, ignore_errors=True)
+            return None
+        target = os.path.join(root, os.path.basename(directory).removeprefix(BUILDING))
+        os.rename(directory, target)
+        link = os.path.join(root, f".{CURRENT}-{uuid4().hex[:8]}")
+        os.symlink(os.path.basename(target), link)
+        os.replace(link, os.path.join(root, CURRENT))
+
+        old = sorted(name for name in os.listdir(root) if name not in (CURRENT, os.path.basename(target)) and not name.startswith("."))
+        # Files still being sent from a deleted snapshot stay readable through their open handles.
+        for name in old[: max(len(old) - keep, 0)]:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+    return target
+
+
+def publish(root=None, base_url=None):
+    return activate(build(root, base_url))
+
+
+def withdraw(root=None):
+    """
+    Stop serving the snapshot, so requests fall back to the live views until the
+    next publish. Builds already running anywhere are refused by activate().
+    """
+    root = str(root or settings.RESUME_SNAPSHOT_DIR)
+    with locked(root):
+        with open(os.path.join(root, WITHDRAWN), "w") as f:
+            f.write(repr(time.time()))
+        try:
+            os.unlink(os.path.join(root, CURRENT))
+        except FileNotFoundError:
+            pass
+
+
+def current(root=None):
+    """(directory, manifest) of the active snapshot, or None. The manifest is reread only when the link changes."""
+    global _loaded
+    link = os.path.join(str(root or settings.RESUME_SNAPSHOT_DIR), CURRENT)
+    try:
+        target = os.path.join(os.path.dirname(link), os.readlink(link))
+    except OSError:
+        return None
+    directory, manifest = _loaded
+    if directory != target:
+        try:
+            with open(os.path.join(target, MANIFEST)) as f:
+                manifest = json.load(f)
+        except OSError:
+            return None
+        _loaded = directory, manifest = target, manifest
+    return directory, manifest
+
+
+def republish():
+    """Background loop: publish until no change arrived during the last build, which activate() then discards."""
+    global _dirty, _running
+    try:
+        while True:
+            with _lock:
+                if not _dirty:
+                    _running = False
+                    return
+                _dirty = False
+            try:
+                publish()
+            except Exception:
+                logger.exception("Failed to publish the resume snapshot")
+    finally:
+        connection.close()
+
+
+def schedule():
+    """
+    When snapshots are on, withdraw the current one and queue a new one once
+    the surrounding transaction commits. Publishing runs in a background
+    thread, or inline when RESUME_SNAPSHOT_BACKGROUND is False.
+    """
+    if settings.RESUME_SNAPSHOT:
+        transaction.on_commit(submit)
+
+
+def submit():
+    global _dirty, _running
+    if not settings.RESUME_SNAPSHOT_BACKGROUND:
+        withdraw()
+        publish()
+        return
+    with _lock:
+        withdraw()
+        _dirty = True
+        if _running:
+            return
+        _running = True
+    # Not a daemon, so a management command that changed data waits for the publish before exiting.
+    threading.Thread(target=republish, name="resume-snapshot").start()
@@ -1,3 +1,703 @@
-from django.test import TestCase
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
+from io import BytesIO, StringIO
+from unittest import skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.contrib.admin import site
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, TestCase, modify_settings, override_settings
+from PIL import Image
+
+from config.static import serve
+from config.storage import compress_file
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from . import bulk_import, search, snapshot
+from .cache import deleted_key, get_cache, get_version
+from .models import Skill, Project, Experience, Education, Certification, SearchDocument
+from .timing import RollingHistogram
+
+
+class ResumeTestCase(TestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    def create_resume(self, rows, skills_per_row=3):
+        """Create `rows` instances of every resume model, each linked to a few skills."""
+        with self.captureOnCommitCallbacks(execute=True):
+            skills = Skill.objects.bulk_create([Skill(name=f"Skill {i}") for i in range(max(rows, skills_per_row))])
+            for i in range(rows):
+                project = Project.objects.create(title=f"Project {i}", description="desc")
+                project.skills.set(skills[:skills_per_row])
+                experience = Experience.objects.create(company=f"Company {i}", position="Developer", description="desc", start_date=date(2020, 1, 1 + i % 28))
+                experience.skills.set(skills[:skills_per_row])
+                Education.objects.create(institution=f"University {i}", degree="BSc", start_date=date(2015, 1, 1 + i % 28), gpa="3.50")
+                Certification.objects.create(name=f"Cert {i}", issuing_organization="Org", issue_date=date(2021, 1, 1 + i % 28))
+
+
+class QueryBudgetTests(ResumeTestCase):
+    """Every list endpoint must run a constant number of queries regardless of row count."""
+
+    # One validator aggregate (see resume/conditional.py) plus the list itself.
+    LIST_ENDPOINTS = {
+        "/api/skills/": 2,
+        "/api/projects/": 3,
+        "/api/experiences/": 3,
+        "/api/education/": 2,
+        "/api/certifications/": 2,
+    }
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_list_endpoints_stay_within_budget(self):
+        self.create_resume(2)
+        small = {url: self.count_queries(url) for url in self.LIST_ENDPOINTS}
+        self.create_resume(20)
+        large = {url: self.count_queries(url) for url in self.LIST_ENDPOINTS}
+
+        for url, budget in self.LIST_ENDPOINTS.items():
+            with self.subTest(url=url):
+                self.assertEqual(small[url], large[url])
+                self.assertLessEqual(large[url], budget)
+
+
+class ResumeEndpointTests(ResumeTestCase):
+    def test_returns_every_collection(self):
+        self.create_resume(3)
+        response = self.client.get("/api/resume/")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(set(data), {"skills", "projects", "experiences", "education", "certifications"})
+        self.assertEqual(len(data["projects"]), 3)
+        self.assertEqual(data["projects"][0]["skills"], self.client.get("/api/projects/").json()[0]["skills"])
+
+    def test_query_count_is_constant(self):
+        self.create_resume(2)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get("/api/resume/")
+        self.create_resume(20)
+        with self.assertNumQueries(len(small.captured_queries)):
+            self.client.get("/api/resume/")
+
+    def test_is_read_only(self):
+        self.assertNotIn("POST", self.client.options("/api/resume/")["Allow"])
+
+
+class ResponseCacheTests(ResumeTestCase):
+    def test_repeat_reads_only_run_validators(self):
+        self.create_resume(3)
+        for url, validators in [("/api/projects/", 1), ("/api/resume/", 5), (f"/api/projects/{Project.objects.first().pk}/", 1)]:
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                with self.assertNumQueries(validators):
+                    second = self.client.get(url)
+                self.assertEqual(first.json(), second.json())
+
+    def test_save_invalidates(self):
+        self.create_resume(1)
+        self.client.get("/api/skills/")
+        version = get_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.filter(name="Skill 0").get().delete()
+        self.assertNotEqual(get_version(), version)
+        self.assertNotIn("Skill 0", [skill["name"] for skill in self.client.get("/api/skills/").json()])
+
+    def test_m2m_change_invalidates(self):
+        self.create_resume(1)
+        project = Project.objects.get()
+        self.assertEqual(len(self.client.get(f"/api/projects/{project.pk}/").json()["skills"]), 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            project.skills.clear()
+        self.assertEqual(self.client.get(f"/api/projects/{project.pk}/").json()["skills"], [])
+
+    def test_no_bump_before_commit(self):
+        self.create_resume(1)
+        version = get_version()
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Skill.objects.create(name="Pending")
+        self.assertEqual(get_version(), version)
+        self.assertEqual(len(callbacks), 1)
+
+
+class ConditionalGetTests(ResumeTestCase):
+    def test_list_and_detail_send_validators(self):
+        self.create_resume(2)
+        for url in ["/api/projects/", f"/api/projects/{Project.objects.first().pk}/", "/api/resume/"]:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertTrue(response["ETag"].startswith('"'))
+                self.assertIn("Last-Modified", response)
+
+    def test_if_none_match_returns_304_without_serializing(self):
+        self.create_resume(2)
+        etag = self.client.get("/api/experiences/")["ETag"]
+        get_cache().clear()
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/experiences/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_if_modified_since_returns_304(self):
+        self.create_resume(1)
+        last_modified = self.client.get("/api/certifications/")["Last-Modified"]
+        self.assertEqual(self.client.get("/api/certifications/", HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+    def test_delete_moves_last_modified(self):
+        self.create_resume(2)
+        # Back-date everything, so the delete lands in a later second than the validator.
+        past = timezone.now() - timedelta(hours=1)
+        Certification.objects.update(updated_at=past)
+        get_cache().set(deleted_key(Certification), past.timestamp(), None)
+        last_modified = self.client.get("/api/certifications/")["Last-Modified"]
+        self.assertEqual(self.client.get("/api/certifications/", HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            Certification.objects.order_by("updated_at").last().delete()
+        self.assertEqual(self.client.get("/api/certifications/", HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 200)
+
+    def test_etag_changes_with_content(self):
+        self.create_resume(2)
+        project = Project.objects.first()
+        detail_etag = self.client.get(f"/api/projects/{project.pk}/")["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            project.skills.remove(project.skills.first())
+        self.assertEqual(self.client.get(f"/api/projects/{project.pk}/", HTTP_IF_NONE_MATCH=detail_etag).status_code, 200)
+
+        list_etag = self.client.get("/api/projects/")["ETag"]
+        skill = project.skills.first()
+        skill.name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            skill.save()
+        self.assertEqual(self.client.get("/api/projects/", HTTP_IF_NONE_MATCH=list_etag).status_code, 200)
+
+    def test_missing_object_is_404(self):
+        self.assertEqual(self.client.get("/api/projects/999/").status_code, 404)
+
+    def test_malformed_pk_is_404(self):
+        for url in ["/api/projects/abc/", "/api/skills/1.5/"]:
+            self.assertEqual(self.client.get(url).status_code, 404, url)
+            with override_settings(RESUME_FAST_SERIALIZERS=True):
+                self.assertEqual(self.client.get(url).status_code, 404, url)
+
+
+class PaginationTests(ResumeTestCase):
+    def test_unpaginated_by_default(self):
+        self.create_resume(3)
+        self.assertIsInstance(self.client.get("/api/experiences/").json(), list)
+
+    def test_cursor_pages_follow_model_ordering(self):
+        self.create_resume(5)
+        expected = [experience["id"] for experience in self.client.get("/api/experiences/").json()]
+        ids, url = [], "/api/experiences/?page_size=2"
+        while url:
+            page = self.client.get(url).json()
+            self.assertLessEqual(len(page["results"]), 2)
+            ids += [experience["id"] for experience in page["results"]]
+            url = page["next"]
+        self.assertEqual(ids, expected)
+        self.assertEqual(ids, list(Experience.objects.order_by("-start_date", "-pk").values_list("pk", flat=True)))
+
+    def test_other_apps_are_not_paginated(self):
+        # djoser's user list has no created_at to order a cursor by.
+        self.client.force_login(User.objects.create_user("reader", password="password"))
+        response = self.client.get("/auth/users/?page_size=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.json(), list)
+
+
+class FieldSelectionTests(ResumeTestCase):
+    def test_only_requested_fields_are_emitted(self):
+        self.create_resume(2)
+        projects = self.client.get("/api/projects/?fields=id,title").json()
+        self.assertEqual([set(project) for project in projects], [{"id", "title"}] * 2)
+
+    def test_only_requested_columns_are_loaded(self):
+        self.create_resume(2)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get("/api/projects/?fields=id,title")
+        # Validator aggregate plus the list query, without prefetching skills.
+        self.assertEqual(len(ctx.captured_queries), 2)
+        self.assertNotIn("description", ctx.captured_queries[-1]["sql"])
+
+    def test_nested_field_keeps_prefetch(self):
+        self.create_resume(2)
+        projects = self.client.get("/api/projects/?fields=title,skills&page_size=1").json()["results"]
+        self.assertEqual(set(projects[0]), {"title", "skills"})
+        self.assertEqual(len(projects[0]["skills"]), 3)
+
+    def test_unknown_field_is_rejected(self):
+        self.assertEqual(self.client.get("/api/skills/?fields=id,password").status_code, 400)
+
+
+class SkillFilterTests(ResumeTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python, self.django, self.go = [Skill.objects.create(name=name) for name in ["Python", "Django", "Go"]]
+            self.both = Project.objects.create(title="Both")
+            self.both.skills.set([self.python, self.django])
+            self.only_python = Project.objects.create(title="Only Python")
+            self.only_python.skills.set([self.python])
+            Project.objects.create(title="None")
+            experience = Experience.objects.create(company="Acme", position="Developer", description="desc", start_date=date(2020, 1, 1))
+            experience.skills.set([self.go])
+
+    def ids(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return {row["id"] for row in response.json()}
+
+    def test_any_and_all(self):
+        skills = f"{self.python.pk},{self.django.pk}"
+        self.assertEqual(self.ids(f"/api/projects/?skills={skills}"), {self.both.pk, self.only_python.pk})
+        self.assertEqual(self.ids(f"/api/projects/?skills={skills}&skills_match=all"), {self.both.pk})
+        self.assertEqual(self.ids(f"/api/experiences/?skills={skills}"), set())
+        self.assertEqual(len(self.ids(f"/api/experiences/?skills={self.go.pk}")), 1)
+        for query in ["skills=python", f"skills={skills}&skills_match=some", "skills=99999999999999999999999", "skills=0", "skills=-1"]:
+            self.assertEqual(self.client.get(f"/api/projects/?{query}").status_code, 400, query)
+
+    def test_filter_adds_no_queries(self):
+        # Same budget as the unfiltered list: validators, the rows and the skills prefetch.
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(f"/api/projects/?skills={self.python.pk},{self.django.pk}&skills_match=all")
+        self.assertEqual(len(ctx.captured_queries), 3)
+        self.assertIn("HAVING", ctx.captured_queries[1]["sql"])
+
+    def test_usage_counts_are_cached_per_version(self):
+        with CaptureQueriesContext(connection) as ctx:
+            usage = self.client.get("/api/skills/usage/").json()
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(
+            [(skill["name"], skill["projects"], skill["experiences"], skill["total"]) for skill in usage],
+            [("Python", 2, 0, 2), ("Django", 1, 0, 1), ("Go", 0, 1, 1)],
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get("/api/skills/usage/")
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.only_python.skills.clear()
+        self.assertEqual(self.client.get("/api/skills/usage/").json()[0]["projects"], 1)
+
+
+class BulkImportTests(ResumeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def write_jsonl(self, records):
+        path = f"{self.tmp}/data.jsonl"
+        with open(path, "w") as f:
+            f.writelines(json.dumps(record) + "\n" for record in records)
+        return path
+
+    def test_streamed_array_matches_json_load(self):
+        with open(settings.BASE_DIR / "fixtures.json") as f:
+            expected = json.load(f)
+            f.seek(0)
+            self.assertEqual(list(bulk_import.iter_json_array(f, chunk_size=7)), expected)
+
+    def test_fixture_import_keeps_pks_timestamps_and_links(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("import_resume", str(settings.BASE_DIR / "fixtures.json"), stdout=StringIO())
+        project = Project.objects.get(pk=1)
+        self.assertEqual([skill.pk for skill in project.skills.order_by("pk")], [1, 3, 5])
+        self.assertEqual(project.updated_at.isoformat(), "2025-09-29T23:07:16.573000+00:00")
+        self.assertEqual(Certification.objects.count(), 5)
+        self.assertEqual(SearchDocument.objects.count(), 25)
+        self.assertEqual(len(self.client.get("/api/projects/").json()), 5)
+
+    def test_resume_after_failure(self):
+        skills = [{"model": "resume.skill", "pk": i, "fields": {"name": f"Skill {i}"}} for i in range(1, 7)]
+        experience = {"model": "resume.experience", "pk": 1, "fields": {"company": "Acme", "position": "Dev", "description": "d", "start_date": "soon", "skills": [1, 2]}}
+        path = self.write_jsonl([*skills, experience])
+        with self.assertRaises(CommandError):
+            call_command("import_resume", path, batch_size=3, stdout=StringIO())
+        # The two batches before the bad record were committed and checkpointed; the index waits for the rerun.
+        self.assertEqual(Skill.objects.count(), 6)
+        self.assertEqual(SearchDocument.objects.filter(model="skill").count(), 0)
+        self.assertEqual(bulk_import.read_checkpoint(f"{path}.progress"), 6)
+
+        experience["fields"]["start_date"] = "2020-01-01"
+        # Only records after the checkpoint are read again, so a changed prefix isn't reimported.
+        path = self.write_jsonl([{"model": "resume.skill", "pk": 99, "fields": {"name": "Skipped"}}, *skills[1:], experience])
+        out = StringIO()
+        call_command("import_resume", path, batch_size=3, resume=True, stdout=out)
+        self.assertIn("rows/s", out.getvalue())
+        self.assertFalse(Skill.objects.filter(pk=99).exists())
+        self.assertEqual(list(Experience.objects.get().skills.values_list("pk", flat=True).order_by("pk")), [1, 2])
+        self.assertFalse(os.path.exists(f"{path}.progress"))
+        self.assertEqual(SearchDocument.objects.filter(model="skill").count(), 6)
+
+    @skipUnless(connection.vendor == "postgresql", "COPY is PostgreSQL-only")
+    def test_copy_matches_batched_inserts(self):
+        fixture = str(settings.BASE_DIR / "fixtures.json")
+
+        def load(use_copy):
+            with open(fixture, encoding="utf-8") as stream:
+                list(bulk_import.run(stream, fixture, batch_size=7, use_copy=use_copy))
+            return {label: list(model.objects.order_by("pk").values()) for label, model in bulk_import.MODELS.items()} | {
+                model._meta.label_lower: list(model.skills.through.objects.order_by(model._meta.model_name, "skill").values_list(model._meta.model_name, "skill"))
+                for model in bulk_import.M2M_MODELS
+            }
+
+        inserted = load(use_copy=False)
+        for model in bulk_import.MODELS.values():
+            model.objects.all().delete()
+        copied = load(use_copy=True)
+        self.assertEqual(copied, inserted)
+        # A replayed batch skips the rows it already wrote, and the id sequences are moved past the imported pks.
+        self.assertEqual(load(use_copy=True), copied)
+        self.assertGreater(Skill.objects.create(name="After import").pk, max(skill["id"] for skill in copied["resume.skill"]))
+
+
+class ValuesSerializerTests(ResumeTestCase):
+    URLS = [
+        "/api/resume/",
+        "/api/skills/",
+        "/api/projects/",
+        "/api/experiences/",
+        "/api/education/",
+        "/api/certifications/",
+        "/api/projects/?fields=id,image,image_srcset",
+        "/api/experiences/?fields=start_date,skills",
+        "/api/projects/?skills=1,2&skills_match=all",
+        "/api/projects/999/",
+    ]
+
+    def setUp(self):
+        super().setUp()
+        self.create_resume(4)
+        project = Project.objects.first()
+        Project.objects.filter(pk=project.pk).update(
+            image="projects/photo.png",
+            image_derivatives={"source": "projects/photo.png", "webp": {"320": "projects/derivatives/0123456789abcdef-320w.webp"}},
+        )
+        # Links written newest skill first, so through-table order and skill order disagree.
+        project.skills.clear()
+        for skill in Skill.objects.order_by("-id"):
+            project.skills.add(skill)
+        self.urls = self.URLS + [f"/api/projects/{project.pk}/", f"/api/education/{Education.objects.first().pk}/"]
+        Education.objects.filter(pk=Education.objects.first().pk).update(gpa=None, end_date=date(2019, 6, 1))
+        Certification.objects.create(name="Cert", issuing_organization="Org", issue_date=date(2022, 2, 2), credential_url="https://example.com/c")
+
+    def fetch(self, url, fast):
+        get_cache().clear()
+        with override_settings(RESUME_FAST_SERIALIZERS=fast):
+            response = self.client.get(url)
+        return response.status_code, response.content
+
+    def test_byte_identical_to_model_serializers(self):
+        for url in self.urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.fetch(url, True), self.fetch(url, False))
+        project = json.loads(self.fetch(self.urls[-2], True)[1])
+        self.assertEqual([skill["id"] for skill in project["skills"]], sorted(Skill.objects.values_list("id", flat=True)))
+
+    @override_settings(RESUME_FAST_SERIALIZERS=True)
+    def test_list_uses_values_and_one_skills_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get("/api/projects/")
+        # Validators, the rows and the grouped skills.
+        self.assertEqual(len(ctx.captured_queries), 3)
+        self.assertNotIn("image_derivatives", ctx.captured_queries[2]["sql"])
+
+    def test_benchmark_command_checks_parity_and_rolls_back(self):
+        out = StringIO()
+        call_command("benchmark_serializers", rows=20, repeat=1, stdout=out)
+        self.assertIn("ProjectSerializer", out.getvalue())
+        self.assertEqual(Project.objects.count(), 4)
+
+
+class SeedCommandTests(ResumeTestCase):
+    def test_seeds_linked_rows(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("seed_resume", projects=30, experiences=20, skills=10, skills_per_row=4, batch_size=7, stdout=StringIO())
+        self.assertEqual(Project.objects.count(), 30)
+        self.assertEqual(Experience.skills.through.objects.count(), 20 * 4)
+        self.assertEqual(len(self.client.get("/api/projects/").json()), 30)
+
+
+@modify_settings(MIDDLEWARE={"prepend": "resume.middleware.ServerTimingMiddleware"})
+class ServerTimingTests(ResumeTestCase):
+    def test_header_and_log_line(self):
+        self.create_resume(2)
+        with self.assertLogs("resume.timing", "INFO") as logs:
+            response = self.client.get("/api/projects/")
+        header = response["Server-Timing"]
+        for metric in ["db;dur=", "auth;dur=", "serialize;dur=", "view;dur=", "total;dur="]:
+            self.assertIn(metric, header)
+        self.assertIn('desc="3 queries"', header)
+        self.assertIn('"queries": 3', logs.output[0])
+
+    def test_metrics_endpoint_is_staff_only(self):
+        with self.assertLogs("resume.timing", "INFO"):
+            self.client.get("/api/skills/")
+            self.assertEqual(self.client.get("/api/metrics/timing/").status_code, 401)
+        self.client.force_login(User.objects.create_user("staff", password="x", is_staff=True))
+        with self.assertLogs("resume.timing", "INFO"):
+            routes = self.client.get("/api/metrics/timing/").json()["routes"]
+        self.assertGreaterEqual(routes["GET api/skills/$"]["count"], 1)
+
+    def test_db_metrics_endpoint(self):
+        self.client.force_login(User.objects.create_user("staff", password="x", is_staff=True))
+        with self.assertLogs("resume.timing", "INFO"):
+            metrics = self.client.get("/api/metrics/db/").json()
+        self.assertEqual(metrics["vendor"], connection.vendor)
+        self.assertIn(metrics["mode"], ["pool", "persistent", "per-request"])
+
+    def test_rolling_histogram_drops_old_slots(self):
+        histogram = RollingHistogram(window=120, slot=60)
+        histogram.observe(3, now=0)
+        histogram.observe(40, now=100)
+        histogram.observe(700, now=110)
+        self.assertEqual(histogram.snapshot(now=110)["count"], 3)
+        self.assertEqual(histogram.snapshot(now=110)["p50_ms"], 50)
+        self.assertEqual(histogram.snapshot(now=170)["count"], 2)
+
+
+class ImageDerivativeTests(ResumeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root, RESUME_IMAGE_WORKERS=0, RESUME_IMAGE_FORMATS=["webp"])
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def upload(self, project, width=1000, height=500):
+        buffer = BytesIO()
+        Image.new("RGB", (width, height), "red").save(buffer, "PNG")
+        with self.captureOnCommitCallbacks(execute=True):
+            project.image.save("shot.png", ContentFile(buffer.getvalue()))
+
+    def test_derivatives_are_generated_on_upload(self):
+        project = Project.objects.create(title="With image")
+        self.upload(project)
+        project.refresh_from_db()
+        self.assertEqual(project.image_derivatives["source"], project.image.name)
+        self.assertEqual(list(project.image_derivatives["webp"]), ["320", "640"])
+        with Image.open(f"{self.media_root}/{project.image_derivatives['webp']['320']}") as derivative:
+            self.assertEqual((derivative.format, derivative.size), ("WEBP", (320, 160)))
+
+        srcset = self.client.get(f"/api/projects/{project.pk}/").json()["image_srcset"]
+        self.assertEqual(list(srcset), ["webp"])
+        self.assertRegex(srcset["webp"], r"^http://testserver/media/projects/derivatives/[0-9a-f]{16}-320w\.webp 320w, .+-640w\.webp 640w$")
+
+    def test_same_content_reuses_files(self):
+        first, second = Project.objects.create(title="One"), Project.objects.create(title="Two")
+        self.upload(first)
+        self.upload(second)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.image_derivatives["webp"], second.image_derivatives["webp"])
+
+    def test_stale_derivatives_are_built_lazily(self):
+        project = Project.objects.create(title="Legacy")
+        self.upload(project, width=200, height=100)
+        Project.objects.filter(pk=project.pk).update(image_derivatives={})
+        get_cache().clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.get(f"/api/projects/{project.pk}/").json()["image_srcset"], {})
+        project.refresh_from_db()
+        self.assertEqual(list(project.image_derivatives["webp"]), ["200"])
+
+    def test_project_without_image(self):
+        Project.objects.create(title="No image")
+        self.assertEqual(self.client.get("/api/projects/").json()[0]["image_srcset"], {})
+
+
+class SearchTests(ResumeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.django = Skill.objects.create(name="Django", description="Web framework")
+        self.project = Project.objects.create(title="Resume site", description="Built with Django and PostgreSQL")
+        Certification.objects.create(name="Kubernetes Administrator", issuing_organization="CNCF", issue_date=date(2022, 5, 1))
+
+    def test_documents_follow_saves_and_deletes(self):
+        self.assertEqual(SearchDocument.objects.count(), 3)
+        self.django.name = "Flask"
+        self.django.save()
+        self.assertEqual(SearchDocument.objects.get(model="skill").title, "Flask")
+        self.project.delete()
+        self.assertFalse(SearchDocument.objects.filter(model="project").exists())
+
+    def test_deferred_fields_are_loaded_for_indexing(self):
+        skill = Skill.objects.only("id", "name").get(pk=self.django.pk)
+        skill.name = "Django REST"
+        with CaptureQueriesContext(connection) as ctx:
+            skill.save()
+        # One query loads the deferred description.
+        self.assertEqual(sum(query["sql"].startswith('SELECT "resume_skill"') for query in ctx.captured_queries), 1)
+        document = SearchDocument.objects.get(model="skill")
+        self.assertEqual((document.title, document.body), ("Django REST", "Web framework"))
+
+    def test_ranked_prefix_search(self):
+        response = self.client.get("/api/search/?q=djan")
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        # The title match outranks the body match.
+        self.assertEqual([(result["type"], result["id"]) for result in results], [("skill", self.django.pk), ("project", self.project.pk)])
+        self.assertTrue(results[0]["url"].endswith(f"/api/skills/{self.django.pk}/"))
+        self.assertEqual(self.client.get("/api/search/?q=djan&type=project").json()["count"], 1)
+        self.assertEqual(self.client.get("/api/search/?q=kube admin").json()["results"][0]["type"], "certification")
+        self.assertEqual(self.client.get("/api/search/?q=django kubernetes").json()["count"], 0)
+
+    def test_invalid_parameters(self):
+        for query in ["", "?q=x&type=user", "?q=x&limit=0", "?q=x&limit=abc"]:
+            self.assertEqual(self.client.get(f"/api/search/{query}").status_code, 400, query)
+
+    def test_rebuild_and_admin_use_the_index(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("seed_resume", projects=5, experiences=5, skills=5, education=0, certifications=0, stdout=StringIO())
+        SearchDocument.objects.all().delete()
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual(SearchDocument.objects.count(), Skill.objects.count() + Project.objects.count() + Experience.objects.count() + 1)
+        self.assertEqual(len(search.object_ids(Project, "project")), 5)
+
+        queryset, may_have_duplicates = site._registry[Skill].get_search_results(RequestFactory().get("/"), Skill.objects.all(), "djan")
+        self.assertEqual(list(queryset), [self.django])
+
+
+@modify_settings(MIDDLEWARE={"prepend": "resume.middleware.SnapshotMiddleware"})
+class SnapshotTests(ResumeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.create_resume(3)
+        overrides = override_settings(
+            RESUME_SNAPSHOT=True,
+            RESUME_SNAPSHOT_DIR=self.root,
+            RESUME_SNAPSHOT_BACKGROUND=False,
+            RESUME_SNAPSHOT_BASE_URL="http://testserver",
+            ALLOWED_HOSTS=["testserver", "other.example"],
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def get(self, url, **extra):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, **extra)
+        content = b"".join(response.streaming_content) if response.streaming else response.content
+        return response, content, len(ctx.captured_queries)
+
+    def test_published_urls_are_served_from_disk(self):
+        live = {url: self.get(url)[1] for url in ["/api/resume/", "/api/projects/", f"/api/skills/{Skill.objects.first().pk}/"]}
+        call_command("publish_snapshot", stdout=StringIO())
+        for url, content in live.items():
+            response, served, queries = self.get(url)
+            self.assertEqual((response.status_code, queries), (200, 0), url)
+            self.assertEqual(served, content)
+            self.assertIn("X-Resume-Snapshot", response)
+
+        response, content, _ = self.get("/api/projects/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(content), live["/api/projects/"])
+        response, content, _ = self.get("/api/projects/", HTTP_ACCEPT_ENCODING="gzip;q=0")
+        self.assertNotIn("Content-Encoding", response)
+        self.assertEqual(content, live["/api/projects/"])
+
+    def test_misses_fall_back_to_the_live_api(self):
+        snapshot.publish()
+        for url, extra in [("/api/projects/?fields=id", {}), ("/api/projects/999/", {}), ("/api/projects/", {"HTTP_HOST": "other.example"})]:
+            response, _, queries = self.get(url, **extra)
+            self.assertNotIn("X-Resume-Snapshot", response, url)
+            self.assertGreater(queries, 0, url)
+
+    def test_edits_republish(self):
+        first = snapshot.publish()
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.create(title="Fresh project")
+        response, content, queries = self.get("/api/projects/")
+        self.assertEqual(queries, 0)
+        self.assertIn(b"Fresh project", content)
+        self.assertNotEqual(response["X-Resume-Snapshot"], os.path.basename(first))
+
+        snapshot.withdraw()
+        self.assertGreater(self.get("/api/projects/")[2], 0)
+
+    def test_older_builds_are_not_activated(self):
+        # As if each build ran in a different process: only ROOT and the manifests are shared.
+        older, newer = snapshot.build(), snapshot.build()
+        in_progress = os.path.join(self.root, f"{snapshot.BUILDING}other")
+        os.makedirs(in_progress)
+        served = snapshot.activate(newer)
+        self.assertIsNone(snapshot.activate(older))
+        self.assertEqual(snapshot.current()[0], served)
+        self.assertFalse(os.path.exists(older))
+
+        stale = snapshot.build()
+        snapshot.withdraw()
+        self.assertIsNone(snapshot.activate(stale))
+        self.assertIsNone(snapshot.current())
+        snapshot.publish()
+        snapshot.publish()
+        # Pruning leaves builds still being written alone.
+        self.assertTrue(os.path.isdir(in_progress))
+        self.assertEqual(len([name for name in os.listdir(self.root) if not name.startswith(".")]), 3)
+
+
+class StaticServingTests(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.name = "app.0123456789ab.css"
+        with open(f"{self.root}/{self.name}", "w") as f:
+            f.write("body { color: red; }\n" * 100)
+        compress_file(f"{self.root}/{self.name}")
+
+    def get(self, path, **headers):
+        return serve(RequestFactory().get("/static/" + path, **headers), path, self.root)
+
+    def test_precompressed_variant_is_negotiated(self):
+        for accept, encoding in [
+            ("gzip, deflate, br", "br"),
+            ("gzip", "gzip"),
+            ("", None),
+            ("gzip;q=0", None),
+            ("br;q=0, gzip", "gzip"),
+            ("identity", None),
+            ("*", "br"),
+            ("*, br;q=0", "gzip"),
+            ("x-brotli, gzipped", None),
+        ]:
+            with self.subTest(accept=accept):
+                response = self.get(self.name, HTTP_ACCEPT_ENCODING=accept)
+                self.assertEqual(response.get("Content-Encoding"), encoding)
+                self.assertEqual(response["Content-Type"], "text/css")
+                self.assertIn("Accept-Encoding", response["Vary"])
+                response.close()
+
+    def test_hashed_names_are_immutable(self):
+        response = self.get(self.name)
+        self.assertEqual(response["Cache-Control"], "public, max-age=31536000, immutable")
+        response.close()
+        with open(f"{self.root}/robots.txt", "w") as f:
+            f.write("User-agent: *\n")
+        response = self.get("robots.txt")
+        self.assertEqual(response["Cache-Control"], "public, max-age=3600")
+        response.close()
+
+    def test_not_modified_and_missing(self):
+        response = self.get(self.name)
+        last_modified = response["Last-Modified"]
+        response.close()
+        self.assertEqual(self.get(self.name, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        with self.assertRaises(Http404):
+            self.get("../etc/passwd")
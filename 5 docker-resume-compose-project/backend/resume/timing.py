@@ -0,0 +1,136 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current = ContextVar("resume_request_timings", default=None)
+
+# Upper bounds of the latency histogram buckets, in milliseconds.
+BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float("inf")]
+
+
+class RequestTimings:
+    """Timings collected for a single request; also usable as a DB execute wrapper."""
+
+    def __init__(self):
+        self.spans = defaultdict(float)
+        self.queries = 0
+        self.db = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db += time.perf_counter() - started
+
+
+def activate(timings):
+    return _current.set(timings)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+@contextmanager
+def measure(name, exclude_db=False):
+    """
+    Add the duration of the block to the current request's `name` span. With
+    `exclude_db` the time spent in queries inside the block is left out.
+    """
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started, db = time.perf_counter(), timings.db
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        if exclude_db:
+            elapsed -= timings.db - db
+        timings.spans[name] += elapsed
+
+
+class RollingHistogram:
+    """Latency histogram over the last `window` seconds, kept in one-minute slots."""
+
+    def __init__(self, window=300, slot=60):
+        self.slot = slot
+        self.slots = window // slot
+        self.data = {}
+        self.lock = threading.Lock()
+
+    def observe(self, milliseconds, now=None):
+        key = int((time.time() if now is None else now) // self.slot)
+        with self.lock:
+            counts, total = self.data.get(key, ([0] * len(BUCKETS_MS), 0.0))
+            counts[bisect_left(BUCKETS_MS, milliseconds)] += 1
+            self.data[key] = (counts, total + milliseconds)
+            for stale in [k for k in self.data if k <= key - self.slots]:
+                del self.data[stale]
+
+    def snapshot(self, now=None):
+        oldest = int((time.time() if now is None else now) // self.slot) - self.slots
+        counts, total = [0] * len(BUCKETS_MS), 0.0
+        with self.lock:
+            for key, (slot_counts, slot_total) in self.data.items():
+                if key > oldest:
+                    counts = [a + b for a, b in zip(counts, slot_counts)]
+                    total += slot_total
+        count = sum(counts)
+        return {
+            "count": count,
+            "mean_ms": round(total / count, 3) if count else None,
+            "p50_ms": self.quantile(counts, 0.50),
+            "p95_ms": self.quantile(counts, 0.95),
+            "p99_ms": self.quantile(counts, 0.99),
+            "buckets": {("+Inf" if bound == float("inf") else str(bound)): n for bound, n in zip(BUCKETS_MS, counts)},
+        }
+
+    @staticmethod
+    def quantile(counts, q):
+        """Upper bound of the bucket holding the q-quantile."""
+        total = sum(counts)
+        if not total:
+            return None
+        seen = 0
+        for bound, n in zip(BUCKETS_MS, counts):
+            seen += n
+            if seen >= q * total:
+                return None if bound == float("inf") else bound
+
+
+class RouteHistograms:
+    def __init__(self):
+        self.routes = defaultdict(RollingHistogram)
+        self.lock = threading.Lock()
+
+    def observe(self, route, milliseconds):
+        with self.lock:
+            histogram = self.routes[route]
+        histogram.observe(milliseconds)
+
+    def snapshot(self):
+        with self.lock:
+            routes = dict(self.routes)
+        return {route: histogram.snapshot() for route, histogram in sorted(routes.items())}
+
+
+histograms = RouteHistograms()
+
+
+class TimedViewMixin:
+    """Report DRF view time and authentication/permission checks to ServerTimingMiddleware."""
+
+    def dispatch(self, request, *args, **kwargs):
+        with measure("view"):
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        with measure("auth"):
+            super().initial(request, *args, **kwargs)
@@ -11,5 +11,9 @@ router.register(r"education", views.EducationViewSet)
 router.register(r"certifications", views.CertificationViewSet)
 
 urlpatterns = [
+    path("resume/", views.ResumeView.as_view(), name="resume"),
+    path("search/", views.SearchView.as_view(), name="search"),
+    path("metrics/timing/", views.TimingMetricsView.as_view(), name="timing-metrics"),
+    path("metrics/db/", views.DatabaseMetricsView.as_view(), name="db-metrics"),
     path("", include(router.urls)),
 ]
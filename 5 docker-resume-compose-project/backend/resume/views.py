@@ -1,7 +1,27 @@
+from django.conf import settings
+from django.db.models import Prefetch
+from django.urls import reverse
+from config import db
 from rest_framework import viewsets
-from rest_framework.permissions import BasePermission
+from rest_framework.generics import get_object_or_404
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import BasePermission, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from . import search
+from .cache import CachedReadMixin, cached_response
+from .conditional import ConditionalGetMixin, collection_state, conditional_response
+from .filters import SkillFilterBackend, usage_count
 from .models import Skill, Project, Experience, Education, Certification
-from .serializers import SkillSerializer, ProjectSerializer, ExperienceSerializer, EducationSerializer, CertificationSerializer
+from .pagination import ResumeCursorPagination, get_ordering
+from .serializers import SkillSerializer, ProjectSerializer, ExperienceSerializer, EducationSerializer, CertificationSerializer, ValuesSerializer
+from .timing import TimedViewMixin, histograms
+
+
+def skills_prefetch():
+    """Load nested skills in one extra query per list instead of one per row, ordered by id like ValuesSerializer.skills()."""
+    return Prefetch("skills", queryset=Skill.objects.only("id", "name").order_by("id"))
 
 
 class IsSuperUserOrReadOnly(BasePermission):
@@ -20,31 +40,218 @@ class IsSuperUserOrReadOnly(BasePermission):
         return request.user and request.user.is_authenticated and request.user.is_staff
 
 
-class SkillViewSet(viewsets.ModelViewSet):
+class FieldSelectionMixin:
+    """
+    Sparse fieldsets: `?fields=id,title` makes the serializer emit, and the
+    queryset load, only the requested columns.
+    """
+
+    fields_query_param = "fields"
+
+    def get_requested_fields(self):
+        value = self.request.query_params.get(self.fields_query_param)
+        if not value or self.action not in ("list", "retrieve"):
+            return None
+        fields = [name.strip() for name in value.split(",") if name.strip()]
+        unknown = set(fields) - set(self.get_serializer_class().Meta.fields)
+        if unknown:
+            raise ValidationError({self.fields_query_param: [f"Unknown field: {name}" for name in sorted(unknown)]})
+        return fields
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_requested_fields()
+        if fields is None:
+            return queryset
+
+        model = queryset.model
+        concrete = {field.name for field in model._meta.concrete_fields}
+        dependencies = getattr(self.get_serializer_class().Meta, "field_dependencies", {})
+        # Ordering columns are read by the cursor paginator to build its links.
+        columns = {name for name in fields if name in concrete} | {name.lstrip("-") for name in get_ordering(model) if name.lstrip("-") in concrete}
+        columns.update(column for name in fields for column in dependencies.get(name, []))
+        if all(name in concrete or name in dependencies for name in fields):
+            # Nothing nested was requested, so skip the prefetch queries.
+            queryset = queryset.prefetch_related(None)
+        return queryset.only(*columns)
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("fields", self.get_requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+
+class ValuesReadMixin:
+    """
+    With RESUME_FAST_SERIALIZERS on, `list` and `retrieve` render through
+    ValuesSerializer instead of the ModelSerializer. Paginated lists keep the
+    regular path, since the cursor paginator reads model instances.
+    """
+
+    def get_values_serializer(self):
+        return ValuesSerializer(self.get_serializer_class(), fields=self.get_requested_fields(), context=self.get_serializer_context())
+
+    def list(self, request, *args, **kwargs):
+        if not settings.RESUME_FAST_SERIALIZERS or (self.paginator and self.paginator.get_page_size(request)):
+            return super().list(request, *args, **kwargs)
+        return Response(self.get_values_serializer().many(self.filter_queryset(self.get_queryset())))
+
+    def retrieve(self, request, *args, **kwargs):
+        if not settings.RESUME_FAST_SERIALIZERS:
+            return super().retrieve(request, *args, **kwargs)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        serializer = self.get_values_serializer()
+        # Same 404 (and malformed-id handling) as get_object().
+        row = get_object_or_404(serializer.rows(self.filter_queryset(self.get_queryset())), **{self.lookup_field: kwargs[lookup_url_kwarg]})
+        return Response(serializer.to_representation([row])[0])
+
+
+class SkillViewSet(TimedViewMixin, ConditionalGetMixin, CachedReadMixin, FieldSelectionMixin, ValuesReadMixin, viewsets.ModelViewSet):
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
+    # Opt-in with ?page_size=N; see resume/pagination.py
+    pagination_class = ResumeCursorPagination
     permission_classes = [IsSuperUserOrReadOnly]
 
+    @action(detail=False)
+    def usage(self, request):
+        """Every skill with the number of projects and experiences using it, most used first."""
+        return cached_response(request, self.build_usage)
 
-class ProjectViewSet(viewsets.ModelViewSet):
-    queryset = Project.objects.all()
+    def build_usage(self, request):
+        skills = (
+            Skill.objects.order_by()
+            .annotate(projects=usage_count(Project.skills.through), experiences=usage_count(Experience.skills.through))
+            .values("id", "name", "projects", "experiences")
+        )
+        usage = [{**skill, "total": skill["projects"] + skill["experiences"]} for skill in skills]
+        usage.sort(key=lambda skill: (-skill["total"], skill["name"], skill["id"]))
+        return Response(usage)
+
+
+class ProjectViewSet(TimedViewMixin, ConditionalGetMixin, CachedReadMixin, FieldSelectionMixin, ValuesReadMixin, viewsets.ModelViewSet):
+    queryset = Project.objects.prefetch_related(skills_prefetch())
     serializer_class = ProjectSerializer
+    pagination_class = ResumeCursorPagination
+    filter_backends = [SkillFilterBackend]
+    conditional_related = ["skills"]
     permission_classes = [IsSuperUserOrReadOnly]
 
 
-class ExperienceViewSet(viewsets.ModelViewSet):
-    queryset = Experience.objects.all()
+class ExperienceViewSet(TimedViewMixin, ConditionalGetMixin, CachedReadMixin, FieldSelectionMixin, ValuesReadMixin, viewsets.ModelViewSet):
+    queryset = Experience.objects.prefetch_related(skills_prefetch())
     serializer_class = ExperienceSerializer
+    pagination_class = ResumeCursorPagination
+    filter_backends = [SkillFilterBackend]
+    conditional_related = ["skills"]
     permission_classes = [IsSuperUserOrReadOnly]
 
 
-class EducationViewSet(viewsets.ModelViewSet):
+class EducationViewSet(TimedViewMixin, ConditionalGetMixin, CachedReadMixin, FieldSelectionMixin, ValuesReadMixin, viewsets.ModelViewSet):
     queryset = Education.objects.all()
     serializer_class = EducationSerializer
+    pagination_class = ResumeCursorPagination
     permission_classes = [IsSuperUserOrReadOnly]
 
 
-class CertificationViewSet(viewsets.ModelViewSet):
+class CertificationViewSet(TimedViewMixin, ConditionalGetMixin, CachedReadMixin, FieldSelectionMixin, ValuesReadMixin, viewsets.ModelViewSet):
     queryset = Certification.objects.all()
     serializer_class = CertificationSerializer
+    pagination_class = ResumeCursorPagination
     permission_classes = [IsSuperUserOrReadOnly]
+
+
+class ResumeView(TimedViewMixin, APIView):
+    """
+    Read-only endpoint returning every resume collection in a single response,
+    so the home page needs one round trip instead of five.
+    """
+
+    permission_classes = [IsSuperUserOrReadOnly]
+    http_method_names = ["get", "head", "options"]
+
+    def get(self, request):
+        states = [collection_state(model.objects.all()) for model in [Skill, Project, Experience, Education, Certification]]
+        return conditional_response(request, states, cached_response, self.build)
+
+    def build(self, request):
+        context = self.get_serializer_context()
+        if settings.RESUME_FAST_SERIALIZERS:
+            return Response(
+                {
+                    "skills": ValuesSerializer(SkillSerializer, context=context).many(SkillViewSet.queryset.all()),
+                    "projects": ValuesSerializer(ProjectSerializer, context=context).many(ProjectViewSet.queryset.all()),
+                    "experiences": ValuesSerializer(ExperienceSerializer, context=context).many(ExperienceViewSet.queryset.all()),
+                    "education": ValuesSerializer(EducationSerializer, context=context).many(EducationViewSet.queryset.all()),
+                    "certifications": ValuesSerializer(CertificationSerializer, context=context).many(CertificationViewSet.queryset.all()),
+                }
+            )
+        return Response(
+            {
+                "skills": SkillSerializer(SkillViewSet.queryset.all(), many=True, context=context).data,
+                "projects": ProjectSerializer(ProjectViewSet.queryset.all(), many=True, context=context).data,
+                "experiences": ExperienceSerializer(ExperienceViewSet.queryset.all(), many=True, context=context).data,
+                "education": EducationSerializer(EducationViewSet.queryset.all(), many=True, context=context).data,
+                "certifications": CertificationSerializer(CertificationViewSet.queryset.all(), many=True, context=context).data,
+            }
+        )
+
+    def get_serializer_context(self):
+        return {"request": self.request, "format": self.format_kwarg, "view": self}
+
+
+class SearchView(TimedViewMixin, APIView):
+    """
+    Ranked full-text search over every resume model: `?q=django rest&type=project,skill&limit=10`.
+    Each word matches as a prefix; results come from the SearchDocument index, not table scans.
+    """
+
+    permission_classes = [IsSuperUserOrReadOnly]
+    http_method_names = ["get", "head", "options"]
+    max_limit = 100
+    snippet_length = 200
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": ["This parameter is required."]})
+        model_names = [name for name in request.query_params.get("type", "").split(",") if name]
+        unknown = set(model_names) - set(search.MODELS)
+        if unknown:
+            raise ValidationError({"type": [f"Unknown type: {name}" for name in sorted(unknown)]})
+        try:
+            limit = int(request.query_params.get("limit", 20))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= self.max_limit:
+            raise ValidationError({"limit": [f"Must be an integer between 1 and {self.max_limit}."]})
+
+        results = [
+            {
+                "type": document.model,
+                "id": document.object_id,
+                "title": document.title,
+                "snippet": document.body[: self.snippet_length],
+                "rank": document.rank,
+                "url": request.build_absolute_uri(reverse(f"{document.model}-detail", args=[document.object_id])),
+            }
+            for document in search.search(query, model_names, limit)
+        ]
+        return Response({"query": query, "count": len(results), "results": results})
+
+
+class TimingMetricsView(APIView):
+    """Staff-only view of the per-route latency histograms kept by ServerTimingMiddleware."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({"routes": histograms.snapshot()})
+
+
+class DatabaseMetricsView(APIView):
+    """Staff-only view of this worker's database connection / pool metrics."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(db.stats())
@@ -20,20 +20,14 @@ const Layout: React.FC = () => {
     useEffect(() => {
         const checkDataExists = async () => {
             try {
-                const [skills, projects, experiences, educations, certifications] = await Promise.all([
-                    apiService.getSkills().catch(() => []),
-                    apiService.getProjects().catch(() => []),
-                    apiService.getExperiences().catch(() => []),
-                    apiService.getEducations().catch(() => []),
-                    apiService.getCertifications().catch(() => [])
-                ]);
+                const resume = await apiService.getResume();
 
                 setDataExists({
-                    skills: skills.length > 0,
-                    projects: projects.length > 0,
-                    experience: experiences.length > 0,
-                    education: educations.length > 0,
-                    certifications: certifications.length > 0
+                    skills: resume.skills.length > 0,
+                    projects: resume.projects.length > 0,
+                    experience: resume.experiences.length > 0,
+                    education: resume.education.length > 0,
+                    certifications: resume.certifications.length > 0
                 });
             } catch (error) {
                 console.error('Error checking data existence:', error);
@@ -0,0 +1,26 @@
+import React from 'react';
+import { Project } from '../types';
+
+// Preferred formats first; the browser picks the first one it supports.
+const FORMATS = ['avif', 'webp'];
+
+interface ProjectImageProps {
+    project: Project;
+    className?: string;
+    sizes?: string;
+}
+
+const ProjectImage: React.FC<ProjectImageProps> = ({ project, className, sizes = '(min-width: 768px) 50vw, 100vw' }) => {
+    const srcset = project.image_srcset || {};
+
+    return (
+        <picture>
+            {FORMATS.filter((format) => srcset[format]).map((format) => (
+                <source key={format} type={`image/${format}`} srcSet={srcset[format]} sizes={sizes} />
+            ))}
+            <img src={project.image} alt={project.title} loading="lazy" className={className} />
+        </picture>
+    );
+};
+
+export default ProjectImage;
@@ -1,6 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
 import { apiService } from '../services/api';
+import ProjectImage from '../components/ProjectImage';
 import { Skill, Project, Experience, Education, Certification } from '../types';
 
 const HomePage: React.FC = () => {
@@ -14,19 +15,13 @@ const HomePage: React.FC = () => {
     useEffect(() => {
         const fetchAllData = async () => {
             try {
-                const [skillsData, projectsData, experiencesData, educationData, certificationsData] = await Promise.all([
-                    apiService.getSkills(),
-                    apiService.getProjects(),
-                    apiService.getExperiences(),
-                    apiService.getEducations(),
-                    apiService.getCertifications(),
-                ]);
+                const resume = await apiService.getResume();
 
-                setSkills(skillsData);
-                setProjects(projectsData);
-                setExperiences(experiencesData);
-                setEducation(educationData);
-                setCertifications(certificationsData);
+                setSkills(resume.skills);
+                setProjects(resume.projects);
+                setExperiences(resume.experiences);
+                setEducation(resume.education);
+                setCertifications(resume.certifications);
             } catch (error) {
                 console.error('Failed to fetch data:', error);
             } finally {
@@ -271,9 +266,9 @@ const HomePage: React.FC = () => {
                                 <div key={project.id} className="border border-gray-200 dark:border-gray-700 rounded-lg p-4 hover:border-primary-300 dark:hover:border-primary-600 transition-colors">
                                     {project.image && (
                                         <div className="h-32 bg-gray-200 dark:bg-gray-700 rounded-md mb-4 overflow-hidden">
-                                            <img
-                                                src={project.image}
-                                                alt={project.title}
+                                            <ProjectImage
+                                                project={project}
+                                                sizes="(min-width: 768px) 50vw, 100vw"
                                                 className="w-full h-full object-cover"
                                             />
                                         </div>
@@ -1,5 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import { apiService } from '../services/api';
+import ProjectImage from '../components/ProjectImage';
 import { Project, Skill } from '../types';
 
 const ProjectsPage: React.FC = () => {
@@ -217,9 +218,9 @@ const ProjectsPage: React.FC = () => {
                                         : 'w-48 h-32 rounded-xl flex-shrink-0'
                                     }
                                 `}>
-                                    <img
-                                        src={project.image}
-                                        alt={project.title}
+                                    <ProjectImage
+                                        project={project}
+                                        sizes={viewMode === 'grid' ? '(min-width: 768px) 33vw, 100vw' : '12rem'}
                                         className="w-full h-full object-cover group-hover:scale-105 transition-transform duration-300"
                                     />
                                 </div>
@@ -5,6 +5,7 @@ import {
   Experience,
   Education,
   Certification,
+  Resume,
   ApiError,
 } from '../types';
 
@@ -82,6 +83,16 @@ class ApiService {
     }
   }
 
+  // Combined Resume API (all collections in one request)
+  async getResume(): Promise<Resume> {
+    try {
+      const response: AxiosResponse<Resume> = await this.api.get('/api/resume/');
+      return response.data;
+    } catch (error) {
+      throw this.handleError(error as AxiosError);
+    }
+  }
+
   // Utility Methods
   isAuthenticated(): boolean {
     return false; // No authentication needed for public resume
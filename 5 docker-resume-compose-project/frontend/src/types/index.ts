@@ -14,6 +14,7 @@ export interface Project {
   production_link?: string;
   github_link?: string;
   image?: string;
+  image_srcset?: Record<string, string>;
   skills: Skill[];
   created_at: string;
   updated_at: string;
@@ -60,6 +61,14 @@ export interface Certification {
   updated_at: string;
 }
 
+export interface Resume {
+  skills: Skill[];
+  projects: Project[];
+  experiences: Experience[];
+  education: Education[];
+  certifications: Certification[];
+}
+
 // API Error Type
 export interface ApiError {
   message: string;